@@ -2,7 +2,16 @@
 
 __version__ = "1.0.0"
 
-from .analyzer import DependencyAnalyzer
-from .graph import DependencyGraph
+__all__ = ["DependencyAnalyzer", "DependencyGraph"]
 
-__all__ = ["DependencyAnalyzer", "DependencyGraph"]
\ No newline at end of file
+
+def __getattr__(name):
+    # PEP 562 lazy imports: keep `import fastdeps` cheap so CLI startup
+    # and worker-process re-imports don't pay for the full pipeline
+    if name == "DependencyAnalyzer":
+        from .analyzer import DependencyAnalyzer
+        return DependencyAnalyzer
+    if name == "DependencyGraph":
+        from .graph import DependencyGraph
+        return DependencyGraph
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,79 @@
+"""Persistent cross-run cache of extracted imports.
+
+Re-parsing is the dominant CPU cost on warm runs (watch mode, repeat
+CLI invocations) even though almost no file changed. Entries are keyed
+by absolute path and validated against (st_mtime_ns, st_size), so a
+matching row lets the worker skip the AST parse entirely. The cache is
+best-effort throughout: any I/O or format problem just means a cold
+run.
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+# Bump when the stored format (or the Import shape) changes
+CACHE_VERSION = 3  # 3: Import became a NamedTuple, changing the pickle layout
+
+_loaded = None
+
+
+def cache_path() -> Path:
+    """Location of the on-disk import cache"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(Path.home(), '.cache')
+    return Path(base) / 'fastdeps' / 'imports.pkl'
+
+
+def _meta():
+    # Include the interpreter version so upgrades invalidate cleanly
+    return (CACHE_VERSION, sys.version_info[:2])
+
+
+def load() -> Dict[str, tuple]:
+    """
+    Load the cache, once per process.
+
+    Returns {path: (mtime_ns, size, imports)} plus a '__meta__' row.
+    Any problem (missing file, stale format) yields an empty cache.
+    """
+    global _loaded
+    if _loaded is None:
+        try:
+            with open(cache_path(), 'rb') as f:
+                data = pickle.load(f)
+            if isinstance(data, dict) and data.get('__meta__') == _meta():
+                _loaded = data
+            else:
+                _loaded = {'__meta__': _meta()}
+        except Exception:
+            _loaded = {'__meta__': _meta()}
+    return _loaded
+
+
+def merge_and_save(new_entries: Dict[str, tuple]):
+    """
+    Merge new entries into the on-disk cache.
+
+    Written atomically (temp file + rename) from the main process only,
+    so concurrent fastdeps runs can't corrupt each other's cache.
+    """
+    if not new_entries:
+        return
+
+    cache = dict(load())
+    cache.update(new_entries)
+    cache['__meta__'] = _meta()
+
+    path = cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent))
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except Exception:
+        # Cache is best-effort; never fail the analysis over it
+        pass
@@ -0,0 +1,108 @@
+"""Optional numba-compiled kernels for graph algorithms.
+
+The CSR arrays produced by DependencyGraph.freeze() are plain int
+buffers, so the hot Tarjan walk can run as native code when numba is
+installed (``pip install fastdeps[jit]``). Everything here degrades to
+``None`` when numba is missing, and numba itself is only imported on
+first use to keep package import cheap.
+"""
+
+from typing import Optional
+
+_tarjan_kernel = None
+_checked = False
+
+
+def get_tarjan() -> Optional[object]:
+    """Return the compiled Tarjan kernel, or None if numba is unavailable.
+
+    The kernel has signature ``(indptr, indices, n) -> int32 array`` and
+    returns a strongly-connected-component label per node.
+    """
+    global _tarjan_kernel, _checked
+    if _checked:
+        return _tarjan_kernel
+    _checked = True
+
+    try:
+        import numpy as np
+        from numba import njit
+    except ImportError:
+        return None
+
+    @njit(cache=True)
+    def tarjan_components(indptr, indices, n):  # pragma: no cover - needs numba
+        index = 0
+        comp_count = 0
+        ids = np.full(n, -1, np.int32)
+        low = np.zeros(n, np.int32)
+        comp = np.full(n, -1, np.int32)
+        on_stack = np.zeros(n, np.uint8)
+        scc_stack = np.empty(n, np.int32)
+        scc_top = 0
+        work_node = np.empty(n, np.int32)
+        work_child = np.empty(n, np.int32)
+
+        for root in range(n):
+            if ids[root] != -1:
+                continue
+
+            top = 0
+            work_node[0] = root
+            work_child[0] = 0
+
+            while top >= 0:
+                v = work_node[top]
+                child = work_child[top]
+
+                if child == 0:
+                    ids[v] = index
+                    low[v] = index
+                    index += 1
+                    scc_stack[scc_top] = v
+                    scc_top += 1
+                    on_stack[v] = 1
+
+                recursed = False
+                start = indptr[v]
+                end = indptr[v + 1]
+                for i in range(start + child, end):
+                    w = indices[i]
+                    if ids[w] == -1:
+                        work_child[top] = i - start + 1
+                        top += 1
+                        work_node[top] = w
+                        work_child[top] = 0
+                        recursed = True
+                        break
+                    elif on_stack[w] and ids[w] < low[v]:
+                        low[v] = ids[w]
+
+                if recursed:
+                    continue
+
+                if low[v] == ids[v]:
+                    while True:
+                        w = scc_stack[scc_top - 1]
+                        scc_top -= 1
+                        on_stack[w] = 0
+                        comp[w] = comp_count
+                        if w == v:
+                            break
+                    comp_count += 1
+
+                top -= 1
+                if top >= 0:
+                    parent = work_node[top]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+
+        return comp
+
+    def run(indptr, indices, n):
+        return tarjan_components(np.asarray(indptr, dtype=np.int32),
+                                 np.asarray(indices, dtype=np.int32),
+                                 n)
+
+    _tarjan_kernel = run
+    return _tarjan_kernel
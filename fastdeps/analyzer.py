@@ -1,28 +1,70 @@
 """Main dependency analyzer - orchestrates the analysis pipeline"""
 
+import multiprocessing as mp
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, List, Set
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
-from .parser import ImportExtractor, find_python_files
+from .parser import Import, ImportExtractor, iter_python_files
 from .parallel import ParallelProcessor
 from .resolver import ModuleResolver
 from .graph import DependencyGraph
 
 
+def resolve_chunk(resolver: ModuleResolver,
+                  items: List[Tuple[Path, List[Import]]],
+                  internal_only: bool) -> Tuple[List[Tuple[Path, Path]],
+                                                List[Tuple[Path, str]]]:
+    """
+    Worker function to resolve imports for a chunk of files.
+
+    Pure function over the resolver, so it can run in a separate
+    process. Returns (internal_edges, external_edges).
+    """
+    internal = []
+    external = []
+
+    for file_path, imports in items:
+        # Batch all of a file's imports into one resolver call
+        pairs = []
+        for imp in imports:
+            if imp.level == 0:
+                pairs.append((imp.module, 0))
+            else:
+                # For "from . import X", use X as module name
+                module_name = imp.names[0] if not imp.module and imp.names else imp.module
+                pairs.append((module_name, imp.level))
+
+        resolved_paths = resolver.resolve_imports(pairs, file_path)
+
+        for imp, resolved in zip(imports, resolved_paths):
+            if resolved:
+                internal.append((file_path, resolved))
+            elif not internal_only and imp.module:
+                if resolver.is_external(imp.module):
+                    external.append((file_path, imp.module))
+
+    return internal, external
+
+
 class DependencyAnalyzer:
     """Main analyzer that coordinates all components"""
 
-    def __init__(self, num_workers: int = None, exclude_dirs: Set[str] = None, ignore_patterns: List[str] = None):
+    def __init__(self, num_workers: int = None, exclude_dirs: Set[str] = None,
+                 ignore_patterns: List[str] = None,
+                 log: Callable[[str], None] = print):
         """
         Args:
             num_workers: Number of parallel workers
             exclude_dirs: Directories to exclude from analysis
             ignore_patterns: Glob patterns to ignore files/folders
+            log: Progress message sink (pass a no-op to silence)
         """
         self.num_workers = num_workers
         self.exclude_dirs = exclude_dirs
         self.ignore_patterns = ignore_patterns or []
+        self.log = log
 
     def analyze(self, target: str, internal_only: bool = False) -> DependencyGraph:
         """
@@ -43,23 +85,22 @@ class DependencyAnalyzer:
         if not target_path.exists():
             raise FileNotFoundError(f"Target not found: {target}")
 
-        # Determine what to analyze
+        # Determine what to analyze - discovery streams straight into
+        # the parallel processor, no intermediate file list
         if target_path.is_file():
             # Single file
             files_to_analyze = [target_path]
             root_path = target_path.parent
         else:
             # Directory/package
-            files_to_analyze = find_python_files(target_path, self.exclude_dirs, self.ignore_patterns)
+            files_to_analyze = iter_python_files(target_path, self.exclude_dirs, self.ignore_patterns)
             root_path = target_path
 
-        print(f"Found {len(files_to_analyze)} Python files to analyze")
-
         # Extract imports from all files (parallel)
-        processor = ParallelProcessor(self.num_workers)
+        processor = ParallelProcessor(self.num_workers, log=self.log)
         file_imports = processor.process_files(files_to_analyze)
 
-        print(f"Extracted imports from {len(file_imports)} files")
+        self.log(f"Extracted imports from {len(file_imports)} files")
 
         # Build module resolver
         resolver = ModuleResolver(root_path)
@@ -68,37 +109,72 @@ class DependencyAnalyzer:
         graph = DependencyGraph()
         graph.root_path = root_path
 
-        for file_path, imports in file_imports.items():
-            # Add file to graph
+        for file_path in file_imports:
             graph.add_file(file_path)
 
-            # Resolve each import
-            for imp in imports:
-                if imp.level == 0:
-                    # Absolute import
-                    resolved = resolver.resolve_import(imp.module, file_path)
-                else:
-                    # Relative import
-                    # For "from . import X", use X as module name
-                    module_name = imp.names[0] if not imp.module and imp.names else imp.module
-                    resolved = resolver.resolve_import(module_name, file_path, imp.level)
-
-                if resolved:
-                    # Internal dependency
-                    graph.add_dependency(file_path, resolved)
-                elif not internal_only and imp.module:
-                    # External dependency
-                    if resolver.is_external(imp.module):
-                        graph.add_external(file_path, imp.module)
+        # Resolve imports (parallel across files); only graph insertion
+        # stays in the main process
+        internal, external = self._resolve_imports(resolver, file_imports,
+                                                   internal_only)
+        graph.add_dependencies(internal)
+        for from_file, module in external:
+            graph.add_external(from_file, module)
 
         elapsed = time.time() - start_time
-        print(f"Analysis complete in {elapsed:.2f} seconds")
+        self.log(f"Analysis complete in {elapsed:.2f} seconds")
 
         # Print stats
         stats = graph.get_stats()
-        print(f"  Files: {stats['total_files']}")
-        print(f"  Dependencies: {stats['total_dependencies']}")
-        print(f"  External: {stats['total_external']}")
-        print(f"  Cycles: {stats['cycles']}")
+        self.log(f"  Files: {stats['total_files']}")
+        self.log(f"  Dependencies: {stats['total_dependencies']}")
+        self.log(f"  External: {stats['total_external']}")
+        self.log(f"  Cycles: {stats['cycles']}")
+
+        return graph
 
-        return graph
\ No newline at end of file
+    def _resolve_imports(self, resolver: ModuleResolver,
+                         file_imports: Dict[Path, List[Import]],
+                         internal_only: bool) -> Tuple[List[Tuple[Path, Path]],
+                                                       List[Tuple[Path, str]]]:
+        """
+        Resolve all extracted imports, in parallel for large projects.
+
+        Returns (internal_edges, external_edges).
+        """
+        items = list(file_imports.items())
+
+        # For small projects, process overhead isn't worth it
+        num_workers = self.num_workers or mp.cpu_count()
+        if len(items) <= 3 or num_workers == 1:
+            return resolve_chunk(resolver, items, internal_only)
+
+        # Split into chunks for better load balancing
+        chunk_size = max(1, len(items) // (num_workers * 4))
+        chunks = [items[i:i + chunk_size]
+                  for i in range(0, len(items), chunk_size)]
+
+        internal = []
+        external = []
+
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            futures = {executor.submit(resolve_chunk, resolver, chunk,
+                                       internal_only): chunk
+                       for chunk in chunks}
+
+            for future in as_completed(futures):
+                try:
+                    chunk_internal, chunk_external = future.result(timeout=30)
+                except Exception as e:
+                    # Resolution is pure, so a failed chunk (worker
+                    # crash, pickling issue) can be redone in-process;
+                    # silently dropping it would yield a graph missing
+                    # edges with nothing to distinguish it from a
+                    # correct one
+                    self.log(f"Worker chunk failed ({e!r}); "
+                             "resolving in-process")
+                    chunk_internal, chunk_external = resolve_chunk(
+                        resolver, futures[future], internal_only)
+                internal.extend(chunk_internal)
+                external.extend(chunk_external)
+
+        return internal, external
\ No newline at end of file
@@ -112,23 +112,15 @@ MCP Server Mode:
 
     args = parser.parse_args()
 
-    # Redirect print statements if quiet
-    if args.quiet:
-        import os
-        sys.stdout = open(os.devnull, 'w')
-
     try:
-        # Run analysis
+        # Run analysis (silence progress messages if quiet)
         analyzer = DependencyAnalyzer(
             num_workers=args.workers,
-            ignore_patterns=args.ignore_file_pattern
+            ignore_patterns=args.ignore_file_pattern,
+            log=(lambda msg: None) if args.quiet else print
         )
         graph = analyzer.analyze(args.target, internal_only=args.internal_only)
 
-        # Restore stdout for output
-        if args.quiet:
-            sys.stdout = sys.__stdout__
-
         # Create renderer
         renderer = GraphRenderer(graph)
 
@@ -137,6 +129,7 @@ MCP Server Mode:
             # Show only cycles
             cycles = graph.find_cycles()
             if cycles:
+                rel = graph.rel_paths()
                 print("Circular dependencies detected:")
                 for i, cycle in enumerate(cycles, 1):
                     print(f"\n{'='*60}")
@@ -144,8 +137,7 @@ MCP Server Mode:
 
                     # Show cycle path
                     for file_path in cycle:
-                        rel_path = file_path.relative_to(graph.root_path) if graph.root_path else file_path
-                        print(f"  → {rel_path}")
+                        print(f"  → {rel[file_path]}")
 
                     # Analyze the cycle
                     analysis = graph.analyze_cycle(cycle)
@@ -187,7 +179,10 @@ MCP Server Mode:
                 if not success:
                     return 1
             elif ext == '.json':
-                output_path.write_text(renderer.to_json())
+                # Stream straight to disk instead of building the full
+                # string first
+                with open(output_path, 'w') as f:
+                    renderer.to_json(file=f)
                 print(f"Saved JSON to {output_path}")
             elif ext == '.txt':
                 output_path.write_text(renderer.to_text())
@@ -1,10 +1,37 @@
 """Dependency graph structure and algorithms"""
 
-from collections import defaultdict, deque
+import heapq
+import operator
+import os
+from array import array
+from collections import defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
 
+from . import _jit
+
+
+class PathRegistry:
+    """
+    Intern Path objects to one canonical instance per path string.
+
+    Duplicate Path instances for the same file (one from discovery, one
+    from the resolver index) each cache their own string and hash;
+    interning collapses them so set/dict operations in the hot graph
+    loops hit an already-hashed instance.
+    """
+
+    def __init__(self):
+        self._instances: Dict[str, Path] = {}
+
+    def intern(self, path: Path) -> Path:
+        key = str(path)
+        canonical = self._instances.get(key)
+        if canonical is None:
+            self._instances[key] = canonical = path
+        return canonical
+
 
 @dataclass
 class Node:
@@ -21,14 +48,25 @@ class DependencyGraph:
     def __init__(self):
         self.nodes: Dict[Path, Node] = {}
         self.root_path: Optional[Path] = None
+        self.registry = PathRegistry()
+        self._cycles_cache: Optional[List[List[Path]]] = None
+        self._csr_cache: Optional[Tuple[List[Path], array, array]] = None
+        self._rel_cache: Optional[Tuple[Optional[Path], Dict[Path, str]]] = None
 
     def add_file(self, file_path: Path):
         """Add a file to the graph"""
+        file_path = self.registry.intern(file_path)
         if file_path not in self.nodes:
             self.nodes[file_path] = Node(path=file_path)
+            self._cycles_cache = None
+            self._csr_cache = None
+            self._rel_cache = None
 
     def add_dependency(self, from_file: Path, to_file: Path):
         """Add a dependency edge"""
+        from_file = self.registry.intern(from_file)
+        to_file = self.registry.intern(to_file)
+
         # Ensure both nodes exist
         self.add_file(from_file)
         self.add_file(to_file)
@@ -36,89 +74,301 @@ class DependencyGraph:
         # Add edge
         self.nodes[from_file].imports.add(to_file)
         self.nodes[to_file].imported_by.add(from_file)
+        self._cycles_cache = None
+        self._csr_cache = None
+
+    def add_dependencies(self, edges) -> None:
+        """
+        Bulk-insert dependency edges.
+
+        Groups edges by source so each node is looked up once and its
+        imports set extended in one update, instead of paying two dict
+        lookups per edge via add_dependency.
+        """
+        intern = self.registry.intern
+        by_src = defaultdict(list)
+        for from_file, to_file in edges:
+            by_src[intern(from_file)].append(intern(to_file))
+
+        if not by_src:
+            return
+
+        for from_file, targets in by_src.items():
+            src_node = self.nodes.get(from_file)
+            if src_node is None:
+                src_node = self.nodes[from_file] = Node(path=from_file)
+            src_node.imports.update(targets)
+            for to_file in targets:
+                self._add_edge_fast(src_node, to_file)
+
+        self._cycles_cache = None
+        self._csr_cache = None
+        self._rel_cache = None
+
+    def _add_edge_fast(self, src_node: Node, dst_path: Path):
+        """
+        Record one edge assuming the source node already exists.
+
+        Skips the redundant add_file round trips that add_dependency
+        pays per edge: one dict probe for the target, no source lookup.
+        The caller is responsible for updating src_node.imports and for
+        invalidating the caches afterwards.
+        """
+        dst = self.nodes.get(dst_path)
+        if dst is None:
+            dst = self.nodes[dst_path] = Node(path=dst_path)
+        dst.imported_by.add(src_node.path)
 
     def add_external(self, from_file: Path, module_name: str):
         """Add an external dependency"""
+        from_file = self.registry.intern(from_file)
         self.add_file(from_file)
         self.nodes[from_file].external_imports.add(module_name)
 
+    def rel_paths(self) -> Dict[Path, str]:
+        """
+        Map every node to its path relative to root_path, as a string.
+
+        relative_to walks part lists and allocates a fresh Path on every
+        call; computing the map once turns the hot rendering loops into
+        dict lookups. Cached until the node set or root_path changes.
+        """
+        if self._rel_cache is not None and self._rel_cache[0] == self.root_path:
+            return self._rel_cache[1]
+
+        if self.root_path:
+            # Plain prefix strip on the string form; relative_to would
+            # rebuild a PurePath part-by-part for every node
+            prefix = str(self.root_path) + os.sep
+            plen = len(prefix)
+            rel = {}
+            for p in self.nodes:
+                s = str(p)
+                rel[p] = s[plen:] if s.startswith(prefix) else s
+        else:
+            rel = {p: str(p) for p in self.nodes}
+
+        self._rel_cache = (self.root_path, rel)
+        return rel
+
+    def freeze(self) -> Tuple[List[Path], array, array]:
+        """
+        Build a CSR (compressed sparse row) snapshot of the adjacency.
+
+        Returns (paths, indptr, indices): node ``i`` is ``paths[i]`` and
+        its successors are ``indices[indptr[i]:indptr[i + 1]]``. Graph
+        algorithms scan these flat arrays instead of chasing per-node
+        set objects. Cached until the graph structure changes.
+        """
+        if self._csr_cache is not None:
+            return self._csr_cache
+
+        paths = list(self.nodes)
+        id_of = {path: i for i, path in enumerate(paths)}
+
+        indptr = array('i', [0] * (len(paths) + 1))
+        indices = array('i')
+        for i, path in enumerate(paths):
+            for target in self.nodes[path].imports:
+                target_id = id_of.get(target)
+                if target_id is not None:
+                    indices.append(target_id)
+            indptr[i + 1] = len(indices)
+
+        self._csr_cache = (paths, indptr, indices)
+        return self._csr_cache
+
     def find_cycles(self) -> List[List[Path]]:
         """
         Find all circular dependencies using Tarjan's algorithm.
 
         Returns list of cycles (each cycle is a list of paths).
-        """
-        index = 0
-        stack = []
-        indices = {}
-        lowlinks = {}
-        on_stack = set()
-        cycles = []
-
-        def strongconnect(node_path: Path):
-            nonlocal index
-
-            indices[node_path] = index
-            lowlinks[node_path] = index
-            index += 1
-            stack.append(node_path)
-            on_stack.add(node_path)
-
-            # Check successors
-            if node_path in self.nodes:
-                for neighbor in self.nodes[node_path].imports:
-                    if neighbor not in indices:
-                        strongconnect(neighbor)
-                        lowlinks[node_path] = min(lowlinks[node_path],
-                                                 lowlinks[neighbor])
-                    elif neighbor in on_stack:
-                        lowlinks[node_path] = min(lowlinks[node_path],
-                                                 indices[neighbor])
-
-            # If node is a root, pop the stack and create SCC
-            if lowlinks[node_path] == indices[node_path]:
-                component = []
-                while True:
-                    w = stack.pop()
-                    on_stack.remove(w)
-                    component.append(w)
-                    if w == node_path:
-                        break
 
-                # Only report actual cycles (more than 1 node)
-                if len(component) > 1:
-                    # Check if it's a real cycle (not just mutual imports)
-                    if self._is_real_cycle(component):
-                        cycles.append(component)
+        The result is cached until the graph structure changes, so
+        repeated calls (e.g. get_stats followed by rendering) only pay
+        for one traversal.
+        """
+        if self._cycles_cache is not None:
+            return self._cycles_cache
 
-        # Run algorithm on all nodes
-        for node_path in self.nodes:
-            if node_path not in indices:
-                strongconnect(node_path)
+        paths, _, _ = self.freeze()
+        cycles = [[paths[i] for i in component]
+                  for component in self._iter_sccs()
+                  if len(component) > 1]
 
+        self._cycles_cache = cycles
         return cycles
 
-    def _is_real_cycle(self, component: List[Path]) -> bool:
-        """Check if component forms a real cycle"""
-        # For each node in component, check if it can reach itself
-        for start in component:
-            visited = set()
-            queue = deque([start])
+    def count_cycles(self) -> int:
+        """
+        Count circular dependencies without materializing cycle paths.
+
+        Cheaper than len(find_cycles()) when only the number is needed:
+        no Path lists are built per component.
+        """
+        if self._cycles_cache is not None:
+            return len(self._cycles_cache)
+
+        return sum(1 for component in self._iter_sccs()
+                   if len(component) > 1)
+
+    def _iter_sccs(self):
+        """
+        Yield strongly connected components as lists of CSR node IDs.
 
-            while queue:
-                current = queue.popleft()
-                if current in visited:
+        Runs on the CSR snapshot: the algorithm works entirely on ints
+        (no Path hashing per edge, no recursion limit). Uses the
+        native-code kernel when numba is installed.
+        """
+        paths, indptr, targets = self.freeze()
+        n = len(paths)
+
+        tarjan = _jit.get_tarjan()
+        if tarjan is not None:
+            labels = tarjan(indptr, targets, n)
+            components = defaultdict(list)
+            for i in range(n):
+                components[labels[i]].append(i)
+            yield from components.values()
+            return
+
+        index = 0
+        stack = []
+        indices = array('i', [-1] * n)
+        lowlinks = array('i', [-1] * n)
+        on_stack = bytearray(n)
+
+        for root in range(n):
+            if indices[root] != -1:
+                continue
+
+            # Iterative Tarjan: work stack holds (node, next-child index)
+            work = [(root, 0)]
+            while work:
+                v, child_idx = work.pop()
+
+                if child_idx == 0:
+                    indices[v] = index
+                    lowlinks[v] = index
+                    index += 1
+                    stack.append(v)
+                    on_stack[v] = 1
+
+                recursed = False
+                start, end = indptr[v], indptr[v + 1]
+                for i in range(start + child_idx, end):
+                    w = targets[i]
+                    if indices[w] == -1:
+                        # "Recurse" into w; resume v at the next child
+                        work.append((v, i - start + 1))
+                        work.append((w, 0))
+                        recursed = True
+                        break
+                    elif on_stack[w]:
+                        if indices[w] < lowlinks[v]:
+                            lowlinks[v] = indices[w]
+
+                if recursed:
                     continue
-                visited.add(current)
 
-                if current in self.nodes:
-                    for neighbor in self.nodes[current].imports:
-                        if neighbor == start and current != start:
-                            return True  # Found cycle back to start
-                        if neighbor in component and neighbor not in visited:
-                            queue.append(neighbor)
+                # All children done: pop SCC if v is a root
+                if lowlinks[v] == indices[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component.append(w)
+                        if w == v:
+                            break
+                    yield component
+
+                # Propagate lowlink to the parent waiting on the work stack
+                if work:
+                    parent = work[-1][0]
+                    if lowlinks[v] < lowlinks[parent]:
+                        lowlinks[parent] = lowlinks[v]
+
+    def trace_imports(self, from_path: Path, to_path: Path,
+                      max_paths: int = 5) -> List[List[Path]]:
+        """
+        Find up to max_paths import chains from one file to another.
 
-        return False
+        Uses bidirectional BFS: expands forward along ``imports`` and
+        backward along ``imported_by``, meeting in the middle. The
+        frontier grows as b^(d/2) instead of b^d, which keeps tracing
+        cheap even on large graphs.
+        """
+        if from_path not in self.nodes or to_path not in self.nodes:
+            return []
+        if from_path == to_path:
+            return [[from_path]]
+
+        # Nothing imports the target or the source imports nothing:
+        # no path can exist, skip the search entirely
+        if not self.nodes[to_path].imported_by or not self.nodes[from_path].imports:
+            return []
+
+        # Parent pointers for each search direction
+        fwd_parent: Dict[Path, Optional[Path]] = {from_path: None}
+        bwd_parent: Dict[Path, Optional[Path]] = {to_path: None}
+        fwd_frontier = [from_path]
+        bwd_frontier = [to_path]
+
+        paths: List[List[Path]] = []
+
+        def reconstruct(meet: Path) -> List[Path]:
+            # Walk forward parents back to the source...
+            head = []
+            node = meet
+            while node is not None:
+                head.append(node)
+                node = fwd_parent[node]
+            head.reverse()
+            # ...then backward parents out to the target
+            node = bwd_parent[meet]
+            while node is not None:
+                head.append(node)
+                node = bwd_parent[node]
+            return head
+
+        while fwd_frontier and bwd_frontier and len(paths) < max_paths:
+            # Always expand the smaller frontier
+            if len(fwd_frontier) <= len(bwd_frontier):
+                next_frontier = []
+                for node in fwd_frontier:
+                    for neighbor in self.nodes[node].imports:
+                        if neighbor not in self.nodes or neighbor in fwd_parent:
+                            continue
+                        # Dead end: a leaf that isn't the target can
+                        # never be on a path to it
+                        if (not self.nodes[neighbor].imports
+                                and neighbor not in bwd_parent):
+                            continue
+                        fwd_parent[neighbor] = node
+                        next_frontier.append(neighbor)
+                        if neighbor in bwd_parent:
+                            paths.append(reconstruct(neighbor))
+                            if len(paths) >= max_paths:
+                                return paths
+                fwd_frontier = next_frontier
+            else:
+                next_frontier = []
+                for node in bwd_frontier:
+                    for neighbor in self.nodes[node].imported_by:
+                        if neighbor not in self.nodes or neighbor in bwd_parent:
+                            continue
+                        if (not self.nodes[neighbor].imported_by
+                                and neighbor not in fwd_parent):
+                            continue
+                        bwd_parent[neighbor] = node
+                        next_frontier.append(neighbor)
+                        if neighbor in fwd_parent:
+                            paths.append(reconstruct(neighbor))
+                            if len(paths) >= max_paths:
+                                return paths
+                bwd_frontier = next_frontier
+
+        return paths
 
     def analyze_cycle(self, cycle: List[Path]) -> Dict:
         """Analyze a cycle to determine if it's likely a false positive"""
@@ -173,19 +423,21 @@ class DependencyGraph:
         total_external = sum(len(node.external_imports)
                            for node in self.nodes.values())
 
-        # Find most imported files
-        import_counts = defaultdict(int)
-        for node in self.nodes.values():
-            for imp in node.imports:
-                import_counts[imp] += 1
-
-        most_imported = sorted(import_counts.items(),
-                              key=lambda x: x[1], reverse=True)[:5]
+        # Find most imported files - imported_by already holds the
+        # reverse edges, so no per-edge counting pass is needed
+        most_imported = heapq.nlargest(
+            5,
+            ((path, len(node.imported_by))
+             for path, node in self.nodes.items()
+             if node.imported_by),
+            key=operator.itemgetter(1))
 
         # Find files with most imports
-        most_imports = sorted([(path, len(node.imports))
-                              for path, node in self.nodes.items()],
-                             key=lambda x: x[1], reverse=True)[:5]
+        most_imports = heapq.nlargest(
+            5,
+            ((path, len(node.imports))
+             for path, node in self.nodes.items()),
+            key=operator.itemgetter(1))
 
         return {
             'total_files': total_files,
@@ -196,34 +448,44 @@ class DependencyGraph:
             'most_imports': most_imports,
         }
 
-    def to_dict(self) -> Dict:
-        """Convert graph to dictionary for JSON serialization"""
-        result = {
-            'nodes': {},
-            'edges': [],
-            'external': {},
-        }
+    def iter_edges(self):
+        """
+        Yield (rel_from, rel_to) string pairs for every internal edge.
 
+        The single source of edge enumeration: to_dict (and through it
+        every JSON output) consumes this, and incremental serializers
+        can iterate it without materializing a list first.
+        """
+        rel = self.rel_paths()
         for file_path, node in self.nodes.items():
-            # Make paths relative for cleaner output
-            rel_path = file_path.relative_to(self.root_path) if self.root_path else file_path
+            rel_path = rel[file_path]
+            for imported in node.imports:
+                yield rel_path, rel[imported]
 
-            result['nodes'][str(rel_path)] = {
-                'imports_count': len(node.imports),
-                'imported_by_count': len(node.imported_by),
-                'external_count': len(node.external_imports),
-            }
+    def to_dict(self) -> Dict:
+        """Convert graph to dictionary for JSON serialization"""
+        # Make paths relative for cleaner output (computed once per node)
+        rel = self.rel_paths()
 
-            # Add edges
-            for imported in node.imports:
-                rel_imported = imported.relative_to(self.root_path) if self.root_path else imported
-                result['edges'].append({
-                    'from': str(rel_path),
-                    'to': str(rel_imported),
-                })
-
-            # Add external deps
-            if node.external_imports:
-                result['external'][str(rel_path)] = sorted(node.external_imports)
+        result = {
+            'nodes': {
+                rel[file_path]: {
+                    'imports_count': len(node.imports),
+                    'imported_by_count': len(node.imported_by),
+                    'external_count': len(node.external_imports),
+                }
+                for file_path, node in self.nodes.items()
+            },
+            # json needs a real list, so the generator is drained here
+            'edges': [
+                {'from': rel_from, 'to': rel_to}
+                for rel_from, rel_to in self.iter_edges()
+            ],
+            'external': {
+                rel[file_path]: sorted(node.external_imports)
+                for file_path, node in self.nodes.items()
+                if node.external_imports
+            },
+        }
 
         return result
\ No newline at end of file
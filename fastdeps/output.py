@@ -1,5 +1,6 @@
 """Output formatters for dependency graphs"""
 
+import io
 import json
 import subprocess
 import tempfile
@@ -8,84 +9,133 @@ from typing import Optional
 
 from .graph import DependencyGraph
 
+# Node color keyed by (is imported, imports others, imported > 3 times);
+# replaces a per-node if/elif chain with one tuple-keyed lookup.
+# Leaf nodes (imported only) are green, roots (importing only) blue,
+# heavily-used interior nodes yellow, everything else white.
+_NODE_COLORS = {
+    (True, False, False): "lightgreen",
+    (True, False, True): "lightgreen",
+    (False, True, False): "lightblue",
+    (False, True, True): "lightblue",
+    (True, True, True): "yellow",
+    (True, True, False): "white",
+    (False, False, False): "white",
+    (False, False, True): "white",
+}
+
 
 class GraphRenderer:
     """Render dependency graphs in various formats"""
 
     def __init__(self, graph: DependencyGraph):
         self.graph = graph
+        # DOT output keyed by show_external; dual-format exports (png +
+        # svg) regenerate the same DOT otherwise
+        self._dot_cache: dict = {}
+
+    def invalidate(self):
+        """Drop cached output after the underlying graph changed"""
+        self._dot_cache.clear()
 
-    def to_dot(self, show_external: bool = False) -> str:
+    def to_dot(self, show_external: bool = False, file=None) -> Optional[str]:
         """
         Generate Graphviz DOT format.
 
         Args:
             show_external: If True, include external dependencies
+            file: Writable text stream; when given, DOT is streamed
+                  into it and None is returned
 
         Returns:
-            DOT format string
+            DOT format string, or None when streaming to a file
         """
-        lines = ["digraph dependencies {"]
-        lines.append('    rankdir="LR";')
-        lines.append('    node [shape=box];')
-        lines.append("")
+        cached = self._dot_cache.get(show_external)
+        if cached is None:
+            # Render once even on the streaming path, so consecutive
+            # exports (save_png then save_svg) share one generation
+            buf = io.StringIO()
+            self._write_dot(buf, show_external)
+            cached = self._dot_cache[show_external] = buf.getvalue()
+
+        if file is None:
+            return cached
+        file.write(cached)
+        return None
+
+    def _write_dot(self, buf, show_external: bool):
+        """Stream DOT output into a writable text buffer"""
+        write = buf.write
+        write('digraph dependencies {\n')
+        write('    rankdir="LR";\n')
+        write('    node [shape=box];\n')
+        write('\n')
+
+        # Relative paths computed once for all node/edge references
+        rel = self.graph.rel_paths()
 
         # Add nodes
         for file_path, node in self.graph.nodes.items():
-            rel_path = file_path.relative_to(self.graph.root_path) if self.graph.root_path else file_path
-            label = str(rel_path).replace('/', '\\n')
-
-            # Color based on characteristics
-            if node.imported_by and not node.imports:
-                # Leaf node (imported but doesn't import)
-                color = "lightgreen"
-            elif node.imports and not node.imported_by:
-                # Root node (imports but not imported)
-                color = "lightblue"
-            elif len(node.imported_by) > 3:
-                # Heavily used module
-                color = "yellow"
-            else:
-                color = "white"
+            rel_path = rel[file_path]
+            label = rel_path.replace('/', '\\n')
 
-            lines.append(f'    "{rel_path}" [label="{label}", fillcolor="{color}", style=filled];')
+            color = _NODE_COLORS[bool(node.imported_by), bool(node.imports),
+                                 len(node.imported_by) > 3]
 
-        lines.append("")
+            write(f'    "{rel_path}" [label="{label}", fillcolor="{color}", style=filled];\n')
 
-        # Add edges for internal dependencies
-        for file_path, node in self.graph.nodes.items():
-            from_path = file_path.relative_to(self.graph.root_path) if self.graph.root_path else file_path
+        write('\n')
 
-            for imported_path in node.imports:
-                to_path = imported_path.relative_to(self.graph.root_path) if self.graph.root_path else imported_path
-                lines.append(f'    "{from_path}" -> "{to_path}";')
+        # Add edges for internal dependencies (one writelines call)
+        buf.writelines(
+            f'    "{rel[file_path]}" -> "{rel[imported_path]}";\n'
+            for file_path, node in self.graph.nodes.items()
+            for imported_path in node.imports
+        )
 
         # Add external dependencies if requested
         if show_external:
-            lines.append("")
-            lines.append("    // External dependencies")
+            write('\n')
+            write('    // External dependencies\n')
 
             for file_path, node in self.graph.nodes.items():
                 if node.external_imports:
-                    from_path = file_path.relative_to(self.graph.root_path) if self.graph.root_path else file_path
+                    from_path = rel[file_path]
 
                     for ext_module in node.external_imports:
                         ext_node = f"ext_{ext_module.replace('.', '_')}"
-                        lines.append(f'    {ext_node} [label="{ext_module}", shape=ellipse, style=dashed];')
-                        lines.append(f'    "{from_path}" -> {ext_node} [style=dashed];')
+                        write(f'    {ext_node} [label="{ext_module}", shape=ellipse, style=dashed];\n')
+                        write(f'    "{from_path}" -> {ext_node} [style=dashed];\n')
 
-        lines.append("}")
-        return "\n".join(lines)
+        write('}')
 
-    def to_json(self) -> str:
-        """Generate JSON representation"""
-        return json.dumps(self.graph.to_dict(), indent=2)
+    def to_json(self, file=None) -> Optional[str]:
+        """
+        Generate JSON representation.
+
+        Args:
+            file: Writable text stream; when given, JSON is streamed
+                  into it (never materializing the full string) and
+                  None is returned
+        """
+        if file is not None:
+            json.dump(self.graph.to_dict(), file, indent=2)
+            return None
+
+        # Use orjson's C encoder when available, stdlib json otherwise
+        try:
+            import orjson
+            return orjson.dumps(self.graph.to_dict(),
+                                option=orjson.OPT_INDENT_2).decode('utf-8')
+        except ImportError:
+            return json.dumps(self.graph.to_dict(), indent=2)
 
     def to_text(self) -> str:
         """Generate human-readable text tree"""
         lines = ["Dependency Analysis Report", "=" * 50, ""]
 
         stats = self.graph.get_stats()
+        rel = self.graph.rel_paths()
 
         # Summary stats
         lines.append(f"Files analyzed: {stats['total_files']}")
@@ -98,16 +148,14 @@ class GraphRenderer:
         if stats['most_imported']:
             lines.append("Most imported files:")
             for path, count in stats['most_imported']:
-                rel_path = path.relative_to(self.graph.root_path) if self.graph.root_path else path
-                lines.append(f"  {rel_path}: {count} imports")
+                lines.append(f"  {rel[path]}: {count} imports")
             lines.append("")
 
         # Files with most imports
         if stats['most_imports']:
             lines.append("Files with most imports:")
             for path, count in stats['most_imports']:
-                rel_path = path.relative_to(self.graph.root_path) if self.graph.root_path else path
-                lines.append(f"  {rel_path}: {count} imports")
+                lines.append(f"  {rel[path]}: {count} imports")
             lines.append("")
 
         # Circular dependencies
@@ -124,16 +172,15 @@ class GraphRenderer:
                     lines.append(f"  Cycle {i}:")
 
                 for file_path in cycle:
-                    rel_path = file_path.relative_to(self.graph.root_path) if self.graph.root_path else file_path
-                    lines.append(f"    → {rel_path}")
+                    lines.append(f"    → {rel[file_path]}")
             lines.append("")
 
         return "\n".join(lines)
 
     def save_dot(self, output_path: Path, show_external: bool = False):
         """Save graph as DOT file"""
-        dot_content = self.to_dot(show_external)
-        output_path.write_text(dot_content)
+        with open(output_path, 'w') as f:
+            self.to_dot(show_external, file=f)
 
     def save_png(self, output_path: Path, show_external: bool = False,
                  show: bool = False):
@@ -145,12 +192,9 @@ class GraphRenderer:
             show_external: Include external dependencies
             show: If True, open the PNG after generation
         """
-        # Generate DOT content
-        dot_content = self.to_dot(show_external)
-
-        # Create temp DOT file
+        # Stream DOT content into a temp file
         with tempfile.NamedTemporaryFile(mode='w', suffix='.dot', delete=False) as f:
-            f.write(dot_content)
+            self.to_dot(show_external, file=f)
             dot_file = f.name
 
         try:
@@ -186,12 +230,45 @@ class GraphRenderer:
             # Clean up temp file
             Path(dot_file).unlink(missing_ok=True)
 
+    def save_many(self, output_base: Path, formats=('png', 'svg'),
+                  show_external: bool = False) -> bool:
+        """
+        Render several formats with a single Graphviz invocation.
+
+        dot process startup is paid once: the DOT source is written to
+        <base>.dot and one `dot -Tpng -Tsvg ... -O` run produces every
+        format, renamed to <base>.png, <base>.svg, etc.
+        """
+        dot_file = output_base.with_suffix('.dot')
+        with open(dot_file, 'w') as f:
+            self.to_dot(show_external, file=f)
+
+        cmd = ['dot'] + [f'-T{fmt}' for fmt in formats] + ['-O', str(dot_file)]
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        except FileNotFoundError:
+            print("Error: Graphviz 'dot' command not found.")
+            return False
+
+        if result.returncode != 0:
+            print(f"Error generating graphs: {result.stderr}")
+            return False
+
+        # -O names outputs <base>.dot.<fmt>; move them to <base>.<fmt>
+        for fmt in formats:
+            produced = Path(f"{dot_file}.{fmt}")
+            if produced.exists():
+                target = output_base.with_suffix(f'.{fmt}')
+                produced.replace(target)
+                print(f"Generated {fmt.upper()}: {target}")
+
+        return True
+
     def save_svg(self, output_path: Path, show_external: bool = False):
         """Save graph as SVG using Graphviz"""
-        dot_content = self.to_dot(show_external)
-
         with tempfile.NamedTemporaryFile(mode='w', suffix='.dot', delete=False) as f:
-            f.write(dot_content)
+            self.to_dot(show_external, file=f)
             dot_file = f.name
 
         try:
@@ -2,78 +2,178 @@
 
 import multiprocessing as mp
 from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain, islice
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, List
 import os
 
+from . import _cache
 from .parser import ImportExtractor, Import
 
+# Shared per-worker state, set up once by _init_worker
+_worker_extractor = None
 
-def process_chunk(file_paths: List[Path]) -> Dict[Path, List[Import]]:
+
+def _init_worker():
+    """
+    Initializer run once per worker process.
+
+    Preloads the import cache and a process-global extractor so each
+    chunk reuses them instead of rebuilding per task.
+    """
+    global _worker_extractor
+    _worker_extractor = ImportExtractor()
+    _cache.load()
+
+
+def process_chunk(file_paths: List[Path]):
     """
     Worker function to process a chunk of files.
     Runs in separate process for true parallelism.
+
+    Returns (results, new_cache_entries): unchanged files are served
+    from the persistent import cache without a parse; freshly parsed
+    files are reported back so the main process can update the cache.
     """
-    extractor = ImportExtractor()
+    extractor = _worker_extractor or ImportExtractor()
+    cache = _cache.load()
     results = {}
+    new_entries = {}
 
     for file_path in file_paths:
         try:
+            stat = os.stat(file_path)
+            key = str(file_path)
+            row = cache.get(key)
+            if row is not None and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+                results[file_path] = row[2]
+                continue
+
             imports = extractor.extract_imports(file_path)
             results[file_path] = imports
+            new_entries[key] = (stat.st_mtime_ns, stat.st_size, imports)
         except Exception:
             # Don't let one bad file break everything
             results[file_path] = []
 
-    return results
+    return results, new_entries
 
 
 class ParallelProcessor:
     """Process files in parallel for maximum speed"""
 
-    def __init__(self, num_workers: int = None):
+    # Upper bound on files per worker submission; also the chunk size
+    # when streaming from a generator of unknown length. Clamping keeps
+    # one slow chunk from starving the pool.
+    CHUNK_SIZE = 64
+
+    def __init__(self, num_workers: int = None,
+                 log: Callable[[str], None] = print):
         """
         Args:
             num_workers: Number of parallel workers (default: CPU count)
+            log: Progress/diagnostic message sink
         """
         self.num_workers = num_workers or mp.cpu_count()
+        self.log = log
 
-    def process_files(self, file_paths: List[Path]) -> Dict[Path, List[Import]]:
+    def process_files(self, file_paths: Iterable[Path]) -> Dict[Path, List[Import]]:
         """
         Process multiple files in parallel.
 
+        Accepts any iterable (including the discovery generator) and
+        streams it in fixed-size chunks with a bounded number of chunks
+        in flight, so large trees never need a materialized file list.
+
         Returns dict mapping file paths to their imports.
         """
-        if not file_paths:
-            return {}
+        iterator = iter(file_paths)
 
         # For small numbers of files, parallel overhead isn't worth it
-        if len(file_paths) <= 3:
-            return process_chunk(file_paths)
-
-        # Split into chunks for better load balancing
-        chunk_size = max(1, len(file_paths) // (self.num_workers * 4))
-        chunks = []
-        for i in range(0, len(file_paths), chunk_size):
-            chunks.append(file_paths[i:i + chunk_size])
+        head = list(islice(iterator, 4))
+        if len(head) <= 3:
+            results, new_entries = process_chunk(head)
+            _cache.merge_and_save(new_entries)
+            return results
+
+        # Pickling dominates for small per-task payloads, so prefer few
+        # large chunks: N // (workers + 2) when the input size is known,
+        # clamped to CHUNK_SIZE
+        if hasattr(file_paths, '__len__'):
+            chunk_size = min(self.CHUNK_SIZE,
+                             max(1, len(file_paths) // (self.num_workers + 2)))
+        else:
+            chunk_size = self.CHUNK_SIZE
 
-        # Process chunks in parallel
         all_results = {}
+        new_entries = {}
+        max_in_flight = self.num_workers * 2
+
+        # Processes, not threads: extraction is ast.parse-bound and the
+        # parser holds the GIL, so threads would serialize the hot loop.
+        # Revisit if extraction ever moves to a GIL-releasing extension.
+        #
+        # forkserver forks workers from a small pre-imported template
+        # instead of copying the parent's full heap (fork) or
+        # re-importing everything (spawn); fall back where unsupported
+        try:
+            mp_context = mp.get_context('forkserver')
+        except ValueError:
+            mp_context = mp.get_context()
 
-        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
-            # Submit all chunks
-            futures = {executor.submit(process_chunk, chunk): chunk
-                      for chunk in chunks}
-
-            # Collect results as they complete
-            for future in as_completed(futures):
-                try:
-                    chunk_results = future.result(timeout=30)
-                    all_results.update(chunk_results)
-                except Exception:
-                    # If a chunk fails, mark files as failed
-                    chunk = futures[future]
-                    for file_path in chunk:
-                        all_results[file_path] = []
-
-        return all_results
\ No newline at end of file
+        chunk_iter = self._iter_chunks(chain(head, iterator), chunk_size)
+        in_flight = {}
+        try:
+            with ProcessPoolExecutor(max_workers=self.num_workers,
+                                     mp_context=mp_context,
+                                     initializer=_init_worker) as executor:
+                for chunk in chunk_iter:
+                    in_flight[executor.submit(process_chunk, chunk)] = chunk
+
+                    if len(in_flight) >= max_in_flight:
+                        done = next(as_completed(in_flight))
+                        self._collect(done, in_flight.pop(done), all_results,
+                                      new_entries)
+
+                for future, chunk in in_flight.items():
+                    self._collect(future, chunk, all_results, new_entries)
+                in_flight = {}
+        except Exception as e:
+            # Pool-level failure (e.g. the pool breaks while chunks are
+            # still being submitted): extraction is pure, so finish the
+            # unmerged and unsubmitted chunks in this process rather
+            # than returning a partial result
+            self.log(f"Worker pool failed ({e!r}); extracting in-process")
+            for chunk in chain(in_flight.values(), chunk_iter):
+                chunk_results, chunk_entries = process_chunk(chunk)
+                all_results.update(chunk_results)
+                new_entries.update(chunk_entries)
+
+        # Single cache write from the main process
+        _cache.merge_and_save(new_entries)
+
+        return all_results
+
+    def _iter_chunks(self, iterator, chunk_size: int):
+        """Slice an iterator into chunk_size lists"""
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _collect(self, future, chunk: List[Path],
+                 all_results: Dict[Path, List[Import]],
+                 new_entries: Dict[str, tuple]):
+        """Merge one finished chunk, redoing it in-process on error"""
+        try:
+            chunk_results, chunk_entries = future.result(timeout=30)
+        except Exception as e:
+            # Extraction is pure, so a failed chunk (worker crash,
+            # start-method/import issue) can be redone here; recording
+            # empty imports instead would yield a silently degraded
+            # graph indistinguishable from a correct one
+            self.log(f"Worker chunk failed ({e!r}); extracting in-process")
+            chunk_results, chunk_entries = process_chunk(chunk)
+        all_results.update(chunk_results)
+        new_entries.update(chunk_entries)
\ No newline at end of file
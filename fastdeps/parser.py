@@ -1,14 +1,23 @@
 """AST-based import extraction - NEVER executes code"""
 
 import ast
+import functools
 import os
-from dataclasses import dataclass
+import sys
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import List, NamedTuple, Optional, Set
 
+# Page-cache advice is a no-op hint where unsupported (non-POSIX)
+_fadvise = getattr(os, 'posix_fadvise', None)
 
-@dataclass
-class Import:
+# Default directories skipped during file discovery
+_DEFAULT_EXCLUDE_DIRS = frozenset({
+    '.git', '__pycache__', '.venv', 'venv', 'env',
+    'node_modules', '.tox', '.mypy_cache', '.pytest_cache',
+})
+
+
+class Import(NamedTuple):
     """Represents a Python import statement"""
     module: Optional[str]  # Module name (e.g., "os.path")
     names: List[str]       # Imported names (e.g., ["join", "exists"])
@@ -17,15 +26,138 @@ class Import:
     is_from: bool          # True for "from X import Y"
 
 
+def _parse_source(source_bytes: bytes):
+    """
+    Parse source bytes into an AST, or None on syntax errors.
+
+    Passing bytes straight to ast.parse keeps encoding-cookie
+    detection and decoding inside CPython's C tokenizer instead of
+    doing a Python-level decode first; only files that aren't valid
+    UTF-8 fall back to the latin-1 path.
+    """
+    try:
+        return ast.parse(source_bytes)
+    except (SyntaxError, ValueError):
+        try:
+            source_bytes.decode('utf-8')
+        except UnicodeDecodeError:
+            # Not UTF-8 - retry with the lossy latin-1 fallback
+            try:
+                return ast.parse(source_bytes.decode('latin-1',
+                                                     errors='replace'))
+            except SyntaxError:
+                return None
+        return None
+
+
+# Statements that open a new scope; skipped when nested imports are off
+_SCOPE_NODES = frozenset({ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef})
+
+
+@functools.lru_cache(maxsize=1024)
+def _extract_cached(source_bytes: bytes, include_nested: bool = True):
+    """
+    Parse source bytes and collect its imports, memoized by content.
+
+    Watch mode and repeated in-process scans hand identical bytes back
+    in; keying on the content (bytes hash) makes those re-analyses a
+    dict hit, and also dedupes renamed copies of the same file. Returns
+    a tuple of Imports, or None when the source doesn't parse.
+    """
+    tree = _parse_source(source_bytes)
+    if tree is None:
+        return None
+
+    imports = []
+
+    # Statement-level walk: ast.walk visits every node including
+    # expressions, but imports can only appear in statement lists.
+    # Pushing just body/orelse/finalbody/handlers keeps the scan
+    # O(statements) instead of O(AST size).
+    # ast node classes are never subclassed in parser output, so the
+    # type-is pointer compare replaces isinstance's MRO scan per node
+    ast_Import = ast.Import
+    ast_ImportFrom = ast.ImportFrom
+    stack = list(tree.body)
+
+    while stack:
+        node = stack.pop()
+        node_type = type(node)
+
+        if node_type is ast_Import:
+            # import os, sys
+            for alias in node.names:
+                imports.append(Import(
+                    module=sys.intern(alias.name),
+                    names=[],
+                    level=0,
+                    line=node.lineno,
+                    is_from=False
+                ))
+
+        elif node_type is ast_ImportFrom:
+            # from os.path import join, exists
+            # from . import utils
+            # from ..package import module
+            # Module and imported names repeat heavily across a
+            # project; interning collapses them to one string each,
+            # so downstream dict/set work hits the identity fast path
+            module = sys.intern(node.module) if node.module else ""
+            level = node.level or 0
+
+            if node.names[0].name == "*":
+                # from module import *
+                names = ["*"]
+            else:
+                names = [sys.intern(alias.name) for alias in node.names]
+
+            imports.append(Import(
+                module=module,
+                names=names,
+                level=level,
+                line=node.lineno,
+                is_from=True
+            ))
+
+        else:
+            # Descend into nested statement lists only (functions,
+            # classes, if/try/with/loops); with include_nested off,
+            # function and class bodies are skipped entirely, leaving
+            # just module scope plus if/try/with blocks
+            if not include_nested and node_type in _SCOPE_NODES:
+                continue
+            body = getattr(node, 'body', None)
+            if body and isinstance(body, list):
+                stack.extend(body)
+            orelse = getattr(node, 'orelse', None)
+            if orelse:
+                stack.extend(orelse)
+            finalbody = getattr(node, 'finalbody', None)
+            if finalbody:
+                stack.extend(finalbody)
+            for handler in getattr(node, 'handlers', ()):
+                stack.extend(handler.body)
+            # match statements keep their suites under cases[*].body
+            for case in getattr(node, 'cases', ()):
+                stack.extend(case.body)
+
+    return tuple(imports)
+
+
 class ImportExtractor:
     """Extract imports using AST parsing - safe and fast"""
 
-    def __init__(self, max_initial_bytes: int = 10240):
+    def __init__(self, max_initial_bytes: int = 10240,
+                 include_nested: bool = True):
         """
         Args:
             max_initial_bytes: Read this many bytes first (most imports at top)
+            include_nested: Also report imports inside function and
+                class bodies; turning this off skips those subtrees,
+                which is most of the AST in typical files
         """
         self.max_initial_bytes = max_initial_bytes
+        self.include_nested = include_nested
 
     def extract_imports(self, file_path: Path) -> List[Import]:
         """
@@ -36,154 +168,205 @@ class ImportExtractor:
         if not file_path.exists():
             return []
 
-        try:
-            # Try reading just the beginning first (fast path)
-            source = self._read_source(file_path, truncate=True)
-            tree = ast.parse(source)
-        except SyntaxError:
+        # Try reading just the beginning first (fast path)
+        source, truncated = self._read_source(file_path, truncate=True)
+
+        # Cheap substring prefilter: every import statement contains the
+        # token "import", so a complete file without it needs no parse.
+        # (A full regex scanner would misreport imports inside strings,
+        # so the AST stays authoritative for files that pass.)
+        if not truncated and b'import' not in source:
+            return []
+
+        extracted = _extract_cached(source, self.include_nested)
+        if extracted is None and truncated:
             # If truncated incorrectly, read full file
-            try:
-                source = self._read_source(file_path, truncate=False)
-                tree = ast.parse(source)
-            except SyntaxError:
-                # File has syntax errors - return empty
+            source, _ = self._read_source(file_path, truncate=False)
+            if b'import' not in source:
                 return []
+            extracted = _extract_cached(source, self.include_nested)
 
-        imports = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                # import os, sys
-                for alias in node.names:
-                    imports.append(Import(
-                        module=alias.name,
-                        names=[],
-                        level=0,
-                        line=node.lineno,
-                        is_from=False
-                    ))
-
-            elif isinstance(node, ast.ImportFrom):
-                # from os.path import join, exists
-                # from . import utils
-                # from ..package import module
-                module = node.module or ""
-                level = node.level or 0
-
-                if node.names[0].name == "*":
-                    # from module import *
-                    names = ["*"]
-                else:
-                    names = [alias.name for alias in node.names]
+        if extracted is None:
+            # File has syntax errors - return empty
+            return []
 
-                imports.append(Import(
-                    module=module,
-                    names=names,
-                    level=level,
-                    line=node.lineno,
-                    is_from=True
-                ))
+        return list(extracted)
+
+    def extract_from_source(self, source) -> List[Import]:
+        """
+        Extract all imports from in-memory source (str or bytes).
+
+        Same parsing and caching path as extract_imports, minus the
+        filesystem; useful for editor buffers and tests.
+        """
+        if isinstance(source, str):
+            source = source.encode('utf-8')
+        extracted = _extract_cached(source, self.include_nested)
+        if extracted is None:
+            return []
+        return list(extracted)
+
+    def _read_source(self, file_path: Path, truncate: bool) -> tuple:
+        """
+        Read Python source file as bytes.
 
-        return imports
+        Uses raw os.open/os.read rather than a buffered file object:
+        the common case is exactly one read syscall per file, with no
+        BufferedReader or extra buffer allocation in between.
 
-    def _read_source(self, file_path: Path, truncate: bool) -> str:
-        """Read Python source file"""
+        Returns (source_bytes, truncated) where truncated is True if
+        the read may have stopped before the end of the file.
+        """
         try:
-            with open(file_path, 'rb') as f:
-                if truncate:
-                    source_bytes = f.read(self.max_initial_bytes)
-                else:
-                    source_bytes = f.read()
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            return b"", False
 
-            # Try UTF-8 first, fallback to latin-1
-            try:
-                return source_bytes.decode('utf-8')
-            except UnicodeDecodeError:
-                return source_bytes.decode('latin-1', errors='replace')
+        try:
+            if _fadvise is not None:
+                try:
+                    if truncate:
+                        # Short read: cap readahead at what we'll use
+                        # and tell the kernel not to keep the pages
+                        _fadvise(fd, 0, self.max_initial_bytes,
+                                 os.POSIX_FADV_SEQUENTIAL)
+                        _fadvise(fd, 0, self.max_initial_bytes,
+                                 os.POSIX_FADV_NOREUSE)
+                    else:
+                        # Full-file retry: prefetch the whole range
+                        _fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                except OSError:
+                    pass
+
+            if truncate:
+                want = self.max_initial_bytes
+                chunks = []
+                while want > 0:
+                    chunk = os.read(fd, want)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                    want -= len(chunk)
+                truncated = want == 0
+            else:
+                chunks = []
+                while True:
+                    chunk = os.read(fd, 1 << 16)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                truncated = False
+            source_bytes = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+            return source_bytes, truncated
         except Exception:
-            return ""
+            return b"", False
+        finally:
+            os.close(fd)
 
 
-def find_python_files(root_path: Path, exclude_dirs: Set[str] = None, ignore_patterns: List[str] = None) -> List[Path]:
+def iter_python_files(root_path: Path, exclude_dirs: Set[str] = None, ignore_patterns: List[str] = None):
     """
     Fast discovery of Python files using os.scandir (faster than Path.rglob)
 
+    Yields paths as the walk progresses so huge trees never need a
+    materialized file list.
+
     Args:
         root_path: Root directory to search
         exclude_dirs: Directory names to exclude
         ignore_patterns: Glob patterns to ignore (e.g., "test_*.py", "**/tests/**", "*.pyc")
     """
     import fnmatch
+    import re
 
     if exclude_dirs is None:
-        exclude_dirs = {'.git', '__pycache__', '.venv', 'venv', 'env',
-                        'node_modules', '.tox', '.mypy_cache', '.pytest_cache'}
-
-    if ignore_patterns is None:
-        ignore_patterns = []
-
-    python_files = []
-    dirs_to_process = [root_path]
-
-    def should_ignore(path: Path) -> bool:
-        """Check if path matches any ignore pattern"""
-        # Convert to relative path from root
-        try:
-            rel_path = path.relative_to(root_path)
-        except ValueError:
-            rel_path = path
-
-        str_path = str(rel_path)
-
+        exclude_dirs = _DEFAULT_EXCLUDE_DIRS
+
+    # The walk operates on plain strings (entry.path is already one);
+    # Path objects are only materialized for yielded matches, never for
+    # excluded files or directories
+    root_str = str(root_path)
+    prefix_len = len(root_str) + 1
+
+    if ignore_patterns:
+        # Pre-compile all patterns into three unioned regexes (matched
+        # against the relative path, each path component, and the bare
+        # filename); one compiled match replaces N fnmatch calls per
+        # entry. Semantics mirror the old per-pattern loop: ** patterns
+        # collapse to single-level globs plus a per-component check,
+        # simple patterns match the relative path or the filename.
+        rel_globs = []
+        part_globs = []
+        name_globs = []
         for pattern in ignore_patterns:
-            # Handle ** patterns for recursive matching
             if '**' in pattern:
-                # Convert ** to match any path depth
-                pattern_regex = pattern.replace('**/', '*/').replace('**', '*')
-                if fnmatch.fnmatch(str_path, pattern_regex):
-                    return True
-                # Also check each path component
-                for part in rel_path.parts:
-                    if fnmatch.fnmatch(part, pattern.replace('**/', '').replace('**', '*')):
-                        return True
+                rel_globs.append(pattern.replace('**/', '*/').replace('**', '*'))
+                part_globs.append(pattern.replace('**/', '').replace('**', '*'))
             else:
-                # Simple pattern matching
-                if fnmatch.fnmatch(str_path, pattern):
-                    return True
-                # Also check just the filename
-                if fnmatch.fnmatch(path.name, pattern):
-                    return True
-
-        return False
+                rel_globs.append(pattern)
+                name_globs.append(pattern)
+
+        def _compile(globs):
+            if not globs:
+                return None
+            return re.compile('|'.join(fnmatch.translate(g) for g in globs))
+
+        rel_re = _compile(rel_globs)
+        part_re = _compile(part_globs)
+        name_re = _compile(name_globs)
+
+        def should_ignore(path_str: str, name: str) -> bool:
+            """Check if path matches any ignore pattern"""
+            # Relative path via prefix slicing instead of Path.relative_to
+            if path_str.startswith(root_str):
+                rel = path_str[prefix_len:]
+            else:
+                rel = path_str
 
-    while dirs_to_process:
-        current_dir = dirs_to_process.pop()
+            if rel_re is not None and rel_re.match(rel):
+                return True
+            if part_re is not None:
+                for part in rel.split(os.sep):
+                    if part_re.match(part):
+                        return True
+            if name_re is not None and name_re.match(name):
+                return True
+            return False
+    else:
+        # No patterns: skip the per-entry call entirely
+        should_ignore = None
+
+    # os.fwalk keeps a directory fd open per level, so descending uses
+    # openat relative to it instead of re-resolving the full path on
+    # every scandir; fall back to os.walk where fwalk doesn't exist.
+    # Both honor in-place pruning of dirnames when walking top-down.
+    if hasattr(os, 'fwalk'):
+        walk_iter = ((dirpath, dirnames, filenames)
+                     for dirpath, dirnames, filenames, _ in os.fwalk(root_str))
+    else:
+        walk_iter = os.walk(root_str)
+
+    sep = os.sep
+    for dirpath, dirnames, filenames in walk_iter:
+        # Prune excluded subdirectories in place so the walk never
+        # descends into them (symlinked dirs are not followed)
+        if should_ignore is None:
+            dirnames[:] = [d for d in dirnames
+                           if not d.startswith('.') and d not in exclude_dirs]
+        else:
+            dirnames[:] = [d for d in dirnames
+                           if not d.startswith('.') and d not in exclude_dirs
+                           and not should_ignore(dirpath + sep + d, d)]
+
+        for name in filenames:
+            if not name.endswith('.py') or name in exclude_dirs:
+                continue
+            path_str = dirpath + sep + name
+            if should_ignore is not None and should_ignore(path_str, name):
+                continue
+            yield Path(path_str)
 
-        # Check if entire directory should be ignored
-        if should_ignore(current_dir):
-            continue
 
-        try:
-            with os.scandir(current_dir) as entries:
-                for entry in entries:
-                    entry_path = Path(entry.path)
-
-                    # Skip hidden and excluded directories
-                    if entry.name.startswith('.') and entry.is_dir():
-                        continue
-                    if entry.name in exclude_dirs:
-                        continue
-
-                    # Check ignore patterns
-                    if should_ignore(entry_path):
-                        continue
-
-                    if entry.is_file() and entry.name.endswith('.py'):
-                        python_files.append(entry_path)
-                    elif entry.is_dir() and not entry.is_symlink():
-                        dirs_to_process.append(entry_path)
-        except (PermissionError, OSError):
-            # Skip directories we can't read
-            continue
-
-    return python_files
\ No newline at end of file
+def find_python_files(root_path: Path, exclude_dirs: Set[str] = None, ignore_patterns: List[str] = None) -> List[Path]:
+    """List variant of iter_python_files, for callers that need len/indexing"""
+    return list(iter_python_files(root_path, exclude_dirs, ignore_patterns))
\ No newline at end of file
@@ -1,73 +1,236 @@
 """Module resolution - convert imports to actual file paths"""
 
+import hashlib
 import os
+import pickle
 import sys
+import tempfile
 from pathlib import Path
-from typing import Dict, Optional, Set, List
+from typing import Dict, List, Optional, Set, Tuple
+
+from . import _cache
+
+# Built indexes shared across resolver instances in one process, keyed
+# by root path string. Repeated construction for the same project (MCP
+# tool calls, watch mode) then reuses the index instead of re-walking.
+_index_memo: Dict[str, tuple] = {}
+
+# Bump when the on-disk index format changes
+_INDEX_VERSION = 2  # 2: file_index holds relative strings, not Paths
+
+# Directories that never contain project modules; on real projects
+# these hold 10-100x more files than the code itself
+_SKIP_DIRS = frozenset({
+    '__pycache__', 'node_modules', '.venv', 'venv', 'env', 'site-packages',
+    '.git', '.hg', '.svn', '.tox', '.mypy_cache', '.pytest_cache',
+    'build', 'dist', '.eggs',
+})
+
+
+def _index_cache_path() -> Path:
+    """On-disk resolver index, alongside the import cache"""
+    return _cache.cache_path().with_name('resolver.pkl')
+
+
+def _load_index_cache() -> dict:
+    """Read the persisted {root: (signature, index, packages)} map"""
+    try:
+        with open(_index_cache_path(), 'rb') as f:
+            data = pickle.load(f)
+        if isinstance(data, dict) and data.get('__meta__') == (
+                _INDEX_VERSION, sys.version_info[:2]):
+            return data
+    except Exception:
+        pass
+    return {}
+
+
+def _save_index_cache(root_str: str, sig: str,
+                      index: Dict[str, str], packages: List[str]):
+    """Persist one root's index, atomically and best-effort"""
+    data = _load_index_cache()
+    # Drop entries for roots that no longer exist (temp dirs etc.)
+    data = {k: v for k, v in data.items()
+            if k == '__meta__' or os.path.isdir(k)}
+    data[root_str] = (sig, index, packages)
+    data['__meta__'] = (_INDEX_VERSION, sys.version_info[:2])
+
+    path = _index_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent))
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except Exception:
+        # Cache is best-effort; never fail resolution over it
+        pass
 
 
 class ModuleResolver:
     """Resolve import statements to actual files"""
 
-    # Python stdlib modules (not exhaustive, but common ones)
-    STDLIB_MODULES = {
-        'abc', 'argparse', 'ast', 'asyncio', 'base64', 'bisect', 'builtins',
-        'collections', 'contextlib', 'copy', 'csv', 'dataclasses', 'datetime',
-        'decimal', 'dis', 'enum', 'functools', 'gc', 'glob', 'hashlib', 'heapq',
-        'http', 'importlib', 'inspect', 'io', 'itertools', 'json', 'logging',
-        'math', 'multiprocessing', 'os', 'pathlib', 'pickle', 'platform', 'queue',
-        'random', 're', 'shutil', 'signal', 'socket', 'sqlite3', 'string',
-        'struct', 'subprocess', 'sys', 'tempfile', 'textwrap', 'threading',
-        'time', 'timeit', 'traceback', 'typing', 'unittest', 'urllib', 'uuid',
-        'warnings', 'weakref', 'xml', 'zipfile',
-    }
-
-    def __init__(self, root_path: Path):
+    # Every stdlib top-level module of the running interpreter, frozen
+    # once at class creation (sys.stdlib_module_names exists on 3.10+,
+    # our floor); replaces a hand-maintained approximation
+    STDLIB_MODULES = frozenset(sys.stdlib_module_names)
+
+    def __init__(self, root_path: Path, ignore_dirs: Set[str] = None):
         """
         Args:
             root_path: Project root directory
+            ignore_dirs: Directory names to skip while indexing
+                (defaults to VCS/venv/build directories)
         """
         self.root_path = root_path.resolve()
-        self.file_index: Dict[str, Path] = {}
+        self.ignore_dirs = (frozenset(ignore_dirs)
+                            if ignore_dirs is not None else _SKIP_DIRS)
+        # Values are root-relative path strings; a Path is only built
+        # for results actually returned from resolve_import. At repo
+        # scale this keeps the index several times smaller than storing
+        # a Path per file and makes it cheap to pickle.
+        self.file_index: Dict[str, str] = {}
         self.package_dirs: Set[Path] = set()
+        self._suffixes: Dict[str, Dict[str, str]] = {}
+        self._load_or_build_index()
+        # Top-level package/module names in the project; is_external
+        # answers with two frozenset probes and no dict walk
+        self._top_levels = frozenset(
+            key.partition('.')[0] for key in self.file_index)
+
+        # Hot-path constants and the per-resolver resolution memo; the
+        # same (module, importing dir) pair recurs for every file in a
+        # package, so each unique resolution is computed once
+        self._root_prefix = str(self.root_path) + os.sep
+        self._root_pkg_prefix = self.root_path.name + '.'
+        # Instance shadow of the class attribute: skips the MRO descent
+        # on every membership test in the hot paths
+        self._stdlib = self.STDLIB_MODULES
+        self._resolve_cache: Dict[tuple, Optional[Path]] = {}
+        self._relative_cache: Dict[tuple, Optional[Path]] = {}
+        self._parts_cache: Dict[Path, Optional[tuple]] = {}
+
+    def _tree_signature(self) -> str:
+        """
+        Cheap fingerprint of the tree's module layout.
+
+        Directory mtimes change whenever files are created, deleted or
+        renamed inside them — exactly the events that invalidate the
+        index — while edits to file contents leave them alone. Hashing
+        (dir path, mtime_ns) over the tree is therefore both a fast and
+        a precise validity key: one stat per directory, none per file.
+        """
+        sig = hashlib.blake2b(digest_size=16)
+        # Different skip configurations index different module sets
+        sig.update('\0'.join(sorted(self.ignore_dirs)).encode())
+        ignore = self.ignore_dirs
+        stack = [str(self.root_path)]
+        while stack:
+            dir_str = stack.pop()
+            try:
+                st = os.stat(dir_str)
+                sig.update(dir_str.encode())
+                sig.update(st.st_mtime_ns.to_bytes(16, 'little', signed=True))
+                with os.scandir(dir_str) as entries:
+                    subdirs = [e.path for e in entries
+                               if e.is_dir(follow_symlinks=False)
+                               and e.name not in ignore
+                               and not e.name.startswith('.')]
+                subdirs.sort()
+                stack.extend(subdirs)
+            except OSError:
+                continue
+        return sig.hexdigest()
+
+    def _load_or_build_index(self):
+        """Reuse a previously built index when the tree is unchanged"""
+        root_str = str(self.root_path)
+        sig = self._tree_signature()
+
+        memo = _index_memo.get(root_str)
+        if memo is not None and memo[0] == sig:
+            _, self.file_index, self.package_dirs, self._suffixes = memo
+            return
+
+        cached = _load_index_cache().get(root_str)
+        if cached is not None and cached[0] == sig:
+            # The stored form is the in-memory form: relative strings.
+            # Re-intern the keys - pickle restores plain strings
+            self.file_index = {sys.intern(m): r for m, r in cached[1].items()}
+            self.package_dirs = {self.root_path / r for r in cached[2]}
+            self._build_suffix_index()
+            _index_memo[root_str] = (sig, self.file_index,
+                                     self.package_dirs, self._suffixes)
+            return
+
         self._build_index()
+        self._build_suffix_index()
+        _index_memo[root_str] = (sig, self.file_index, self.package_dirs,
+                                 self._suffixes)
+
+        prefix_len = len(root_str) + 1
+        _save_index_cache(
+            root_str, sig, self.file_index,
+            [str(d)[prefix_len:] for d in self.package_dirs])
+
+    def _build_suffix_index(self):
+        """
+        Index every module under each of its dotted prefixes.
+
+        _suffixes['a.b'] maps 'c.d' to the path indexed as 'a.b.c.d',
+        so the sibling and parent-package probes become one dict hit on
+        the suffix instead of concatenating and hashing the full dotted
+        key per import.
+        """
+        self._suffixes = {}
+        setdefault = self._suffixes.setdefault
+        for module, path in self.file_index.items():
+            pos = module.find('.')
+            while pos != -1:
+                setdefault(module[:pos], {})[module[pos + 1:]] = path
+                pos = module.find('.', pos + 1)
 
     def _build_index(self):
         """Build an index of all Python modules in the project"""
-        for root, dirs, files in os.walk(self.root_path):
-            root_path = Path(root)
-
-            # Check if this is a package (has __init__.py)
-            if '__init__.py' in files:
-                self.package_dirs.add(root_path)
-
-            # Index all Python files
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = root_path / file
-                    # Convert file path to module path
-                    try:
-                        rel_path = file_path.relative_to(self.root_path)
-                        module_path = self._path_to_module(rel_path)
-                        self.file_index[module_path] = file_path
-                    except ValueError:
-                        # File outside root - skip
-                        pass
-
-    def _path_to_module(self, rel_path: Path) -> str:
-        """Convert file path to module name"""
-        # Remove .py extension
-        if rel_path.suffix == '.py':
-            if rel_path.stem == '__init__':
-                # Package __init__.py - just use directory path
-                parts = rel_path.parts[:-1]
-            else:
-                # Regular module
-                parts = list(rel_path.parts[:-1]) + [rel_path.stem]
-        else:
-            parts = rel_path.parts
-
-        return '.'.join(parts) if parts else ""
+        # Stack-based scandir walk on plain strings: DirEntry carries
+        # the type bits from readdir, so classifying entries needs no
+        # extra stat, and the module key comes from slicing the known
+        # root prefix instead of Path.relative_to per file
+        root_str = str(self.root_path)
+        prefix_len = len(root_str) + 1
+        sep = os.sep
+        ignore = self.ignore_dirs
+        stack = [root_str]
+
+        while stack:
+            dir_str = stack.pop()
+            try:
+                with os.scandir(dir_str) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            # Never descend into VCS/venv/cache trees
+                            if name not in ignore and not name.startswith('.'):
+                                stack.append(entry.path)
+                            continue
+                        if not name.endswith('.py'):
+                            continue
+
+                        # Module key: relative path, minus .py, with
+                        # __init__ collapsing to its directory
+                        rel = entry.path[prefix_len:]
+                        parts = rel[:-3].split(sep)
+                        if name == '__init__.py':
+                            self.package_dirs.add(Path(dir_str))
+                            parts = parts[:-1]
+
+                        # Interned on both sides: the parser interns
+                        # extracted module names, so lookups against
+                        # interned keys short-circuit on identity
+                        self.file_index[sys.intern('.'.join(parts))] = rel
+            except OSError:
+                # Skip directories we can't read
+                continue
 
     def resolve_import(self, module_name: str, from_file: Path,
                       level: int = 0) -> Optional[Path]:
@@ -83,163 +246,205 @@ class ModuleResolver:
             Path to the resolved file, or None if external/stdlib
         """
         if level == 0:
-            # Absolute import
+            # Absolute import - by far the common case
             return self._resolve_absolute(module_name, from_file)
         else:
             # Relative import
             return self._resolve_relative(module_name, from_file, level)
 
-    def _resolve_absolute(self, module_name: str, from_file: Path = None) -> Optional[Path]:
-        """Resolve absolute import"""
+    def resolve_imports(self, imports: List[Tuple[str, int]],
+                        from_file: Path) -> List[Optional[Path]]:
+        """
+        Resolve a batch of (module_name, level) imports from one file.
+
+        One call per file instead of one per import statement: the
+        dispatch targets are bound once and every entry shares the
+        per-directory memo state warmed by its predecessors.
+        """
+        resolve_absolute = self._resolve_absolute
+        resolve_relative = self._resolve_relative
+        return [resolve_absolute(module, from_file) if level == 0
+                else resolve_relative(module, from_file, level)
+                for module, level in imports]
+
+    def _resolve_absolute(self, module_name: str,
+                          from_file: Optional[Path]) -> Optional[Path]:
+        """
+        Resolve an absolute import, memoized per importing directory.
+
+        A plain bound method on purpose: resolvers are pickled into
+        worker processes by the analyzer, and an instance-stored
+        closure would break that. The handful of attributes the fast
+        path needs are hoisted to locals here instead.
+        """
         if not module_name:
             return None
 
         # Check if it's a known stdlib module
-        top_level = module_name.split('.')[0]
-        if top_level in self.STDLIB_MODULES:
+        if module_name.partition('.')[0] in self._stdlib:
             return None  # Stdlib - no file path
 
-        # If we have from_file, check siblings FIRST to avoid false cycles
-        # This is critical for cases like "from data_shelf import X" inside data_shelf package
-        if from_file:
-            try:
-                from_rel = from_file.relative_to(self.root_path)
-                from_parts = list(from_rel.parts[:-1])  # Get directory parts
-
-                # Try module as sibling in same directory
-                if from_parts:
-                    # First try the full sibling path
-                    sibling_module = '.'.join(from_parts + [module_name])
-
-                    # CRITICAL: When importing "data_shelf" from within data_shelf package,
-                    # prefer "data_shelf.data_shelf" (the file) over "data_shelf" (the package)
-                    # This prevents false cycles
-                    if sibling_module in self.file_index:
-                        resolved = self.file_index[sibling_module]
-                        # If not __init__, this is what we want
-                        if resolved.stem != '__init__':
-                            return resolved
+        # Resolution only depends on the importing *directory*, so
+        # all files in one package share memo entries
+        key = (module_name, from_file.parent if from_file else None)
+        cache = self._resolve_cache
+        if key in cache:
+            return cache[key]
 
-                    # Try as sibling package __init__.py
-                    sibling_init = f"{sibling_module}.__init__"
-                    if sibling_init in self.file_index:
-                        return self.file_index[sibling_init]
-
-                    # Finally, if we got __init__ earlier, return it
-                    if sibling_module in self.file_index:
-                        return self.file_index[sibling_module]
-
-                # Also try resolving within parent package
-                # e.g., from gaia_airflow/dags/file.py, "utils.x" -> "gaia_airflow.utils.x"
-                if len(from_parts) > 1:
-                    # Try one level up
-                    parent_parts = from_parts[:-1]
-                    parent_module = '.'.join(parent_parts + module_name.split('.'))
-                    if parent_module in self.file_index:
-                        return self.file_index[parent_module]
-                    parent_init = f"{parent_module}.__init__"
-                    if parent_init in self.file_index:
-                        return self.file_index[parent_init]
-            except ValueError:
-                pass
+        rel = self._resolve_absolute_uncached(module_name, key[1])
+        resolved = self.root_path / rel if rel is not None else None
+        cache[key] = resolved
+        return resolved
+
+    def _resolve_absolute_uncached(self, module_name: str,
+                                   from_dir: Optional[Path]) -> Optional[str]:
+        """
+        Probe the index for an absolute import, most specific first.
+
+        This and its relative sibling are the resolver's hot loops;
+        they deliberately stay on dicts, strings, and locals (bound
+        methods hoisted below) so CPython's specializing interpreter
+        handles them well without a compiled extension.
+
+        Note on packages: _build_index keys a package by its bare
+        dotted name ('pkg', not 'pkg.__init__'), so a plain lookup
+        already finds __init__.py files and no '…' + '.__init__' probe
+        strings ever need to be built.
+        """
+        get = self.file_index.get
+        suffixes_get = self._suffixes.get
+
+        # If we know the importing directory, check siblings FIRST to
+        # avoid false cycles - critical for cases like
+        # "from data_shelf import X" inside the data_shelf package
+        if from_dir is not None:
+            from_str = str(from_dir)
+            if from_str.startswith(self._root_prefix):
+                base = from_str[len(self._root_prefix):].replace(os.sep, '.')
+
+                # Try module as sibling in same directory, probing the
+                # suffix index so the full dotted key is never built
+                sub = suffixes_get(base)
+                if sub is not None:
+                    resolved = sub.get(module_name)
+                    if resolved is not None:
+                        return resolved
+
+                # Also try resolving within parent package, e.g. from
+                # gaia_airflow/dags/file.py, "utils.x" -> "gaia_airflow.utils.x"
+                parent_base = base.rpartition('.')[0]
+                if parent_base:
+                    sub = suffixes_get(parent_base)
+                    if sub is not None:
+                        resolved = sub.get(module_name)
+                        if resolved is not None:
+                            return resolved
 
         # If module starts with the root package name, strip it
         # e.g., "gaia_elf_v3.agsearch_elf_v2" -> "agsearch_elf_v2"
-        if self.root_path and self.root_path.name == top_level:
-            stripped_module = '.'.join(module_name.split('.')[1:]) if '.' in module_name else ''
-            if stripped_module:
-                # Try with stripped version first
-                if stripped_module in self.file_index:
-                    return self.file_index[stripped_module]
-                stripped_init = f"{stripped_module}.__init__"
-                if stripped_init in self.file_index:
-                    return self.file_index[stripped_init]
-
-        # Try direct module lookup
-        if module_name in self.file_index:
-            return self.file_index[module_name]
-
-        # Try as package __init__.py
-        package_init = f"{module_name}.__init__"
-        if package_init in self.file_index:
-            return self.file_index[package_init]
-
-        # Try parent packages
-        parts = module_name.split('.')
-        for i in range(len(parts) - 1, 0, -1):
-            parent = '.'.join(parts[:i])
-            if parent in self.file_index:
-                # Found parent module
-                return self.file_index[parent]
-            parent_init = f"{parent}.__init__"
-            if parent_init in self.file_index:
-                return self.file_index[parent_init]
-
-        return None  # External dependency
+        if module_name.startswith(self._root_pkg_prefix):
+            resolved = get(module_name[len(self._root_pkg_prefix):])
+            if resolved is not None:
+                return resolved
+
+        # Try direct module (or package __init__) lookup
+        resolved = get(module_name)
+        if resolved is not None:
+            return resolved
+
+        # Try parent packages, peeling one dotted segment at a time
+        parent = module_name
+        while True:
+            parent = parent.rpartition('.')[0]
+            if not parent:
+                return None  # External dependency
+            resolved = get(parent)
+            if resolved is not None:
+                return resolved
 
     def _resolve_relative(self, module_name: str, from_file: Path,
                           level: int) -> Optional[Path]:
         """Resolve relative import"""
-        try:
-            # Get the package containing from_file
-            from_rel = from_file.relative_to(self.root_path)
-            from_parts = list(from_rel.parts)
-
-            # If from __init__.py, package is the directory
-            if from_rel.stem == '__init__':
-                from_parts = from_parts[:-1]
-            else:
-                # Regular module - package is parent directory
-                from_parts = from_parts[:-1]
-
-            # Go up 'level-1' directories (level=1 means current package)
-            if level > len(from_parts) + 1:
-                # Too many levels - invalid import
-                return None
+        # Pure function of its arguments; "from . import x" repeats for
+        # nearly every file in a package, so memoize like the absolute
+        # path does (keyed on the file itself here, since __init__
+        # modules anchor one level higher than regular ones)
+        key = (module_name, from_file, level)
+        cache = self._relative_cache
+        if key in cache:
+            return cache[key]
+
+        rel = self._resolve_relative_uncached(module_name, from_file, level)
+        resolved = self.root_path / rel if rel is not None else None
+        cache[key] = resolved
+        return resolved
+
+    def _package_parts(self, from_dir: Path) -> Optional[tuple]:
+        """
+        Dotted-path components of a directory relative to the root.
 
-            if level > 1:
-                # Go up level-1 directories
-                from_parts = from_parts[:-(level - 1)] if len(from_parts) >= level - 1 else []
+        Every import in a file needs its containing package's parts;
+        caching per directory computes them once for the whole package
+        rather than once per import statement. None means the directory
+        lies outside the project root.
+        """
+        cache = self._parts_cache
+        if from_dir in cache:
+            return cache[from_dir]
 
-            # Append the module name
-            if module_name:
-                target_parts = from_parts + module_name.split('.')
+        if from_dir == self.root_path:
+            parts = ()
+        else:
+            from_str = str(from_dir)
+            if from_str.startswith(self._root_prefix):
+                parts = tuple(from_str[len(self._root_prefix):].split(os.sep))
             else:
-                target_parts = from_parts
-
-            # Try to resolve
-            target_module = '.'.join(target_parts) if target_parts else ""
-            if target_module in self.file_index:
-                return self.file_index[target_module]
-
-            # Try as package
-            if target_module:
-                target_init = f"{target_module}"
-                if target_init in self.file_index:
-                    return self.file_index[target_init]
-
-        except (ValueError, IndexError):
-            pass
+                parts = None
+
+        cache[from_dir] = parts
+        return parts
+
+    def _resolve_relative_uncached(self, module_name: str, from_file: Path,
+                                   level: int) -> Optional[str]:
+        """Walk up from the importing package and probe the index"""
+        # Package containing from_file: its directory (__init__.py and
+        # regular modules both anchor there). _package_parts signals an
+        # out-of-root file with None instead of raising, so this path
+        # runs exception-free
+        parts = self._package_parts(from_file.parent)
+        if parts is None:
+            # File outside root
+            return None
 
-        return None
+        # Go up 'level-1' directories (level=1 means current package);
+        # the cached tuple is sliced directly, never copied to a list
+        if level > len(parts) + 1:
+            # Too many levels - invalid import
+            return None
+        if level > 1:
+            cut = level - 1
+            parts = parts[:-cut] if len(parts) >= cut else ()
+
+        # Join the package base with the (already dotted) module name.
+        # Packages are keyed by their bare dotted name, so this covers
+        # module and __init__ targets alike
+        base = '.'.join(parts)
+        if module_name:
+            target_module = base + '.' + module_name if base else module_name
+        else:
+            target_module = base
+        return self.file_index.get(target_module)
 
     def is_external(self, module_name: str) -> bool:
         """Check if module is external (not in project or stdlib)"""
         if not module_name:
             return False
 
-        top_level = module_name.split('.')[0]
-
-        # Check stdlib
-        if top_level in self.STDLIB_MODULES:
-            return False
-
-        # Check if in our project
-        if module_name in self.file_index:
-            return False
-
-        # Check package
-        if f"{module_name}.__init__" in self.file_index:
-            return False
+        # partition avoids materializing a list just for the first part
+        top_level = module_name.partition('.')[0]
 
-        return True
\ No newline at end of file
+        # Two O(1) frozenset probes: stdlib, then project top-levels.
+        # Matching on the top-level name means an unresolved submodule
+        # of a project package is not misreported as an external dep.
+        return (top_level not in self._stdlib
+                and top_level not in self._top_levels)
\ No newline at end of file
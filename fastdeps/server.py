@@ -4,13 +4,67 @@ FastDeps MCP Server - Simplified implementation following Serena's pattern
 """
 
 import asyncio
+import functools
 import json
+import sys
 from pathlib import Path
 from typing import Any
 
 # Core imports
 from .analyzer import DependencyAnalyzer
+from .graph import DependencyGraph
 from .output import GraphRenderer
+from .parser import find_python_files
+
+# Graphs cached across tool calls in the same MCP session, keyed by
+# (resolved path, internal_only) and validated by the newest source mtime
+_graph_cache: dict = {}
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_path(project_path: str) -> Path:
+    """
+    Resolve a project path once per distinct input.
+
+    Path.resolve walks every component with stat to expand symlinks;
+    back-to-back tool calls almost always name the same project (most
+    often '.'), so the result is cached. Existence is still checked per
+    call - that's one stat, and it can legitimately change.
+    """
+    return Path(project_path).resolve()
+
+
+def _get_graph(abs_path: Path, internal_only: bool) -> DependencyGraph:
+    """
+    Analyze a project, reusing a cached graph when nothing changed.
+
+    A lightweight scan over the project's Python files decides whether
+    the cached graph is still valid; back-to-back tool calls on the
+    same path then skip parsing and resolution entirely. The key pairs
+    the newest mtime with the file count - mtime alone would miss the
+    deletion or rename of a non-newest file.
+    """
+    if abs_path.is_dir():
+        files = find_python_files(abs_path)
+    else:
+        files = [abs_path]
+    latest_mtime = max((f.stat().st_mtime for f in files), default=0.0)
+    validity = (len(files), latest_mtime)
+
+    key = (abs_path, internal_only)
+    cached = _graph_cache.get(key)
+    if cached is not None and cached[0] == validity:
+        return cached[1]
+
+    # Run analysis (no multiprocessing in MCP context, and progress
+    # lines go to stderr - stdout carries the JSON-RPC stream)
+    analyzer = DependencyAnalyzer(
+        num_workers=1,
+        log=lambda msg: print(msg, file=sys.stderr))
+    graph = analyzer.analyze(str(abs_path), internal_only=internal_only)
+    _graph_cache[key] = (validity, graph)
+    return graph
+
 
 async def main():
     """Main MCP server entry point using stdio."""
@@ -75,6 +129,11 @@ async def main():
                         "project_path": {
                             "type": "string",
                             "default": "."
+                        },
+                        "detailed": {
+                            "type": "boolean",
+                            "description": "Include full cycle paths (count only if false)",
+                            "default": True
                         }
                     },
                     "required": []
@@ -107,7 +166,7 @@ async def main():
                 include_external = arguments.get("include_external", False)
 
                 # Resolve to absolute path
-                abs_path = Path(project_path).resolve()
+                abs_path = _resolve_path(project_path)
                 if not abs_path.exists():
                     return [TextContent(
                         type="text",
@@ -119,55 +178,58 @@ async def main():
                 print(f"FastDeps MCP: Analyzing {abs_path} (internal_only={not include_external})",
                       file=sys.stderr, flush=True)
 
-                # Run analysis (disable multiprocessing in MCP context)
-                analyzer = DependencyAnalyzer(num_workers=1)
-                graph = analyzer.analyze(
-                    str(abs_path),
-                    internal_only=not include_external
-                )
-
-                # Format output
-                renderer = GraphRenderer(graph)
-
-                if output_format == "json":
-                    result = renderer.to_json()
-                elif output_format == "text":
-                    result = renderer.to_text()
-                elif output_format == "dot":
-                    result = renderer.to_dot(show_external=include_external)
-                else:
-                    result = renderer.to_json()
+                # Analysis and rendering are synchronous filesystem +
+                # CPU work; one to_thread hop keeps the event loop
+                # responsive without bouncing back per step
+                def analyze_and_render() -> str:
+                    graph = _get_graph(abs_path, not include_external)
+                    renderer = GraphRenderer(graph)
+
+                    if output_format == "text":
+                        return renderer.to_text()
+                    if output_format == "dot":
+                        return renderer.to_dot(show_external=include_external)
+                    return renderer.to_json()
+
+                result = await asyncio.to_thread(analyze_and_render)
 
                 return [TextContent(type="text", text=result)]
 
             elif name == "find_circular_deps":
                 project_path = arguments.get("project_path", ".")
+                detailed = arguments.get("detailed", True)
 
                 # Resolve to absolute path
-                abs_path = Path(project_path).resolve()
+                abs_path = _resolve_path(project_path)
                 if not abs_path.exists():
                     return [TextContent(
                         type="text",
                         text=f"Error: Path does not exist: {project_path} (resolved to {abs_path})"
                     )]
 
-                # Run analysis (disable multiprocessing in MCP context)
-                analyzer = DependencyAnalyzer(num_workers=1)
-                graph = analyzer.analyze(str(abs_path), internal_only=True)
+                def find_and_format() -> str:
+                    graph = _get_graph(abs_path, True)
+
+                    if not detailed:
+                        # Count only - skips building the cycle path lists
+                        count = graph.count_cycles()
+                        if count == 0:
+                            return "No circular dependencies found! ✨"
+                        return f"Found {count} circular dependencies"
 
-                # Find cycles
-                cycles = graph.find_cycles()
+                    cycles = graph.find_cycles()
+                    if not cycles:
+                        return "No circular dependencies found! ✨"
 
-                if not cycles:
-                    result = "No circular dependencies found! ✨"
-                else:
+                    rel = graph.rel_paths()
                     lines = [f"Found {len(cycles)} circular dependencies:"]
                     for i, cycle in enumerate(cycles, 1):
                         lines.append(f"\nCycle {i}:")
                         for file_path in cycle:
-                            rel_path = file_path.relative_to(graph.root_path) if graph.root_path else file_path
-                            lines.append(f"  → {rel_path}")
-                    result = "\n".join(lines)
+                            lines.append(f"  → {rel[file_path]}")
+                    return "\n".join(lines)
+
+                result = await asyncio.to_thread(find_and_format)
 
                 return [TextContent(type="text", text=result)]
 
@@ -175,31 +237,29 @@ async def main():
                 project_path = arguments.get("project_path", ".")
 
                 # Resolve to absolute path
-                abs_path = Path(project_path).resolve()
+                abs_path = _resolve_path(project_path)
                 if not abs_path.exists():
                     return [TextContent(
                         type="text",
                         text=f"Error: Path does not exist: {project_path} (resolved to {abs_path})"
                     )]
 
-                # Run analysis (disable multiprocessing in MCP context)
-                analyzer = DependencyAnalyzer(num_workers=1)
-                graph = analyzer.analyze(str(abs_path), internal_only=False)
-
-                # Get stats
-                stats = graph.get_stats()
-
-                # Format as JSON
-                result = json.dumps({
-                    "total_files": stats['total_files'],
-                    "total_dependencies": stats['total_dependencies'],
-                    "external_dependencies": stats['total_external'],
-                    "circular_dependencies": stats['cycles'],
-                    "most_imported": [
-                        str(path.relative_to(graph.root_path) if graph.root_path else path)
-                        for path, _ in stats['most_imported'][:3]
-                    ]
-                }, indent=2)
+                def stats_json() -> str:
+                    graph = _get_graph(abs_path, False)
+                    stats = graph.get_stats()
+                    rel = graph.rel_paths()
+
+                    return json.dumps({
+                        "total_files": stats['total_files'],
+                        "total_dependencies": stats['total_dependencies'],
+                        "external_dependencies": stats['total_external'],
+                        "circular_dependencies": stats['cycles'],
+                        "most_imported": [
+                            rel[path] for path, _ in stats['most_imported'][:3]
+                        ]
+                    }, indent=2)
+
+                result = await asyncio.to_thread(stats_json)
 
                 return [TextContent(type="text", text=result)]
 
@@ -0,0 +1,24 @@
+"""Shared test configuration"""
+
+import os
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_cache_dir(tmp_path_factory):
+    """Point fastdeps' on-disk caches at a throwaway directory.
+
+    The import cache and the resolver index persist themselves under
+    XDG_CACHE_HOME (falling back to ~/.cache); without this redirect,
+    merely running the tests would write pytest temp-dir entries into
+    the developer's real cache files.
+    """
+    cache_home = tmp_path_factory.mktemp("cache")
+    old = os.environ.get("XDG_CACHE_HOME")
+    os.environ["XDG_CACHE_HOME"] = str(cache_home)
+    yield
+    if old is None:
+        os.environ.pop("XDG_CACHE_HOME", None)
+    else:
+        os.environ["XDG_CACHE_HOME"] = old
@@ -0,0 +1,69 @@
+"""Tests for the end-to-end analyzer"""
+
+import pytest
+
+from fastdeps.analyzer import DependencyAnalyzer
+
+# Small project with root modules, a package, a relative import and
+# one external dependency
+PROJECT_FILES = {
+    "main.py": "import helpers\nfrom pkg import mod\n",
+    "helpers.py": "import os\nimport requests\n",
+    "pkg/__init__.py": "",
+    "pkg/mod.py": "from . import other\n",
+    "pkg/other.py": "import helpers\n",
+    "lone.py": "",
+}
+
+
+@pytest.fixture(scope="module")
+def project(tmp_path_factory):
+    """One shared project tree for the whole module"""
+    temp_dir = tmp_path_factory.mktemp("analyzer_project")
+    for rel, content in PROJECT_FILES.items():
+        path = temp_dir / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return temp_dir
+
+
+def _edges(graph, root):
+    """Internal edges as root-relative (from, to) string pairs"""
+    return {
+        (src.relative_to(root).as_posix(), dst.relative_to(root).as_posix())
+        for src, node in graph.nodes.items()
+        for dst in node.imports
+    }
+
+
+def test_analyze_builds_expected_edges(project):
+    """Serial analysis finds every internal and external dependency"""
+    analyzer = DependencyAnalyzer(num_workers=1, log=lambda msg: None)
+    graph = analyzer.analyze(str(project))
+
+    assert _edges(graph, project) == {
+        ("main.py", "helpers.py"),
+        ("main.py", "pkg/__init__.py"),
+        ("pkg/mod.py", "pkg/other.py"),
+        ("pkg/other.py", "helpers.py"),
+    }
+    externals = {module for node in graph.nodes.values()
+                 for module in node.external_imports}
+    assert externals == {"requests"}
+
+
+def test_multiworker_matches_serial(project):
+    """Multi-worker analysis must produce the same graph as serial.
+
+    Regression test: the resolver is pickled into worker processes, so
+    anything unpicklable on it (e.g. an instance-stored closure) makes
+    every chunk fail and silently drops all edges.
+    """
+    serial = DependencyAnalyzer(num_workers=1,
+                                log=lambda msg: None).analyze(str(project))
+    parallel = DependencyAnalyzer(num_workers=2,
+                                  log=lambda msg: None).analyze(str(project))
+
+    serial_edges = _edges(serial, project)
+    assert serial_edges  # guard: parity below must not be vacuous
+    assert _edges(parallel, project) == serial_edges
@@ -115,6 +115,38 @@ class TestDependencyGraph(unittest.TestCase):
         # Self-import is weird but not a multi-file cycle
         self.assertEqual(len(cycles), 0)
 
+    def test_trace_imports_direct(self):
+        """Test tracing a direct import"""
+        a = Path("/project/a.py")
+        b = Path("/project/b.py")
+        self.graph.add_dependency(a, b)
+
+        paths = self.graph.trace_imports(a, b)
+
+        self.assertEqual(paths, [[a, b]])
+
+    def test_trace_imports_indirect(self):
+        """Test tracing an import chain A -> B -> C"""
+        a = Path("/project/a.py")
+        b = Path("/project/b.py")
+        c = Path("/project/c.py")
+        self.graph.add_dependency(a, b)
+        self.graph.add_dependency(b, c)
+
+        paths = self.graph.trace_imports(a, c)
+
+        self.assertEqual(paths, [[a, b, c]])
+
+    def test_trace_imports_no_path(self):
+        """Test tracing when no import path exists"""
+        a = Path("/project/a.py")
+        b = Path("/project/b.py")
+        self.graph.add_dependency(b, a)  # Only b -> a, not a -> b
+
+        paths = self.graph.trace_imports(a, b)
+
+        self.assertEqual(paths, [])
+
     def test_get_stats(self):
         """Test statistics generation"""
         a = Path("/project/a.py")
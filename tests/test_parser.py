@@ -4,172 +4,156 @@ import tempfile
 import unittest
 from pathlib import Path
 
-from fastdeps.parser import ImportExtractor, Import, find_python_files
+import pytest
+
+from fastdeps.parser import ImportExtractor, find_python_files
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    """One stateless extractor shared by every test in this module"""
+    return ImportExtractor()
+
+
+# One expected Import per source snippet: (module, names, level, is_from)
+SINGLE_IMPORT_CASES = [
+    ("import os\n", "os", [], 0, False),
+    ("from os import path\n", "os", ["path"], 0, True),
+    ("from os import path, environ\n", "os", ["path", "environ"], 0, True),
+    ("from os import *\n", "os", ["*"], 0, True),
+    ("from . import utils\n", "", ["utils"], 1, True),
+    ("from ..package import module\n", "package", ["module"], 2, True),
+    ("from os.path import join\n", "os.path", ["join"], 0, True),
+]
+
+
+@pytest.mark.parametrize("source,module,names,level,is_from",
+                         SINGLE_IMPORT_CASES,
+                         ids=[case[0].strip() for case in SINGLE_IMPORT_CASES])
+def test_single_import(extractor, source, module, names, level, is_from):
+    """Each snippet yields exactly one Import with the expected fields"""
+    imports = extractor.extract_from_source(source)
+
+    assert len(imports) == 1
+    imp = imports[0]
+    assert imp.module == module
+    assert imp.names == names
+    assert imp.level == level
+    assert imp.is_from is is_from
+
+
+def test_multiple_imports(extractor):
+    """Test: import os, sys"""
+    imports = extractor.extract_from_source("import os, sys\n")
+
+    assert len(imports) == 2
+    modules = [imp.module for imp in imports]
+    assert "os" in modules
+    assert "sys" in modules
+
+
+def test_import_in_match_case(extractor):
+    """Test imports inside match case suites are detected"""
+    content = """
+match value:
+    case 1:
+        import json
+    case _:
+        from os import path
+"""
+    imports = extractor.extract_from_source(content)
 
+    assert len(imports) == 2
+    modules = [imp.module for imp in imports]
+    assert "json" in modules
+    assert "os" in modules
 
-class TestImportExtractor(unittest.TestCase):
-    """Test import extraction"""
 
-    def setUp(self):
-        self.extractor = ImportExtractor()
-        self.temp_dir = tempfile.mkdtemp()
-
-    def _create_file(self, content: str, name: str = "test.py") -> Path:
-        """Helper to create test Python file"""
-        file_path = Path(self.temp_dir) / name
-        file_path.write_text(content)
-        return file_path
-
-    def test_simple_import(self):
-        """Test: import os"""
-        file_path = self._create_file("import os\n")
-        imports = self.extractor.extract_imports(file_path)
-
-        self.assertEqual(len(imports), 1)
-        self.assertEqual(imports[0].module, "os")
-        self.assertEqual(imports[0].names, [])
-        self.assertEqual(imports[0].level, 0)
-        self.assertEqual(imports[0].is_from, False)
-
-    def test_multiple_imports(self):
-        """Test: import os, sys"""
-        file_path = self._create_file("import os, sys\n")
-        imports = self.extractor.extract_imports(file_path)
-
-        self.assertEqual(len(imports), 2)
-        modules = [imp.module for imp in imports]
-        self.assertIn("os", modules)
-        self.assertIn("sys", modules)
-
-    def test_from_import(self):
-        """Test: from os import path"""
-        file_path = self._create_file("from os import path\n")
-        imports = self.extractor.extract_imports(file_path)
-
-        self.assertEqual(len(imports), 1)
-        self.assertEqual(imports[0].module, "os")
-        self.assertEqual(imports[0].names, ["path"])
-        self.assertEqual(imports[0].is_from, True)
-
-    def test_from_import_multiple(self):
-        """Test: from os import path, environ"""
-        file_path = self._create_file("from os import path, environ\n")
-        imports = self.extractor.extract_imports(file_path)
-
-        self.assertEqual(len(imports), 1)
-        self.assertEqual(imports[0].module, "os")
-        self.assertEqual(set(imports[0].names), {"path", "environ"})
-
-    def test_from_import_star(self):
-        """Test: from os import *"""
-        file_path = self._create_file("from os import *\n")
-        imports = self.extractor.extract_imports(file_path)
-
-        self.assertEqual(len(imports), 1)
-        self.assertEqual(imports[0].module, "os")
-        self.assertEqual(imports[0].names, ["*"])
-
-    def test_relative_import_single_dot(self):
-        """Test: from . import utils"""
-        file_path = self._create_file("from . import utils\n")
-        imports = self.extractor.extract_imports(file_path)
-
-        self.assertEqual(len(imports), 1)
-        self.assertEqual(imports[0].module, "")
-        self.assertEqual(imports[0].names, ["utils"])
-        self.assertEqual(imports[0].level, 1)
-
-    def test_relative_import_double_dot(self):
-        """Test: from ..package import module"""
-        file_path = self._create_file("from ..package import module\n")
-        imports = self.extractor.extract_imports(file_path)
-
-        self.assertEqual(len(imports), 1)
-        self.assertEqual(imports[0].module, "package")
-        self.assertEqual(imports[0].names, ["module"])
-        self.assertEqual(imports[0].level, 2)
-
-    def test_nested_import(self):
-        """Test: from os.path import join"""
-        file_path = self._create_file("from os.path import join\n")
-        imports = self.extractor.extract_imports(file_path)
-
-        self.assertEqual(len(imports), 1)
-        self.assertEqual(imports[0].module, "os.path")
-        self.assertEqual(imports[0].names, ["join"])
-
-    def test_import_in_function(self):
-        """Test imports inside functions are detected"""
-        content = """
+def test_import_in_function(extractor):
+    """Test imports inside functions are detected"""
+    content = """
 def my_func():
     import json
     from datetime import datetime
     return json.dumps({})
 """
-        file_path = self._create_file(content)
-        imports = self.extractor.extract_imports(file_path)
+    imports = extractor.extract_from_source(content)
 
-        self.assertEqual(len(imports), 2)
-        modules = [imp.module for imp in imports]
-        self.assertIn("json", modules)
-        self.assertIn("datetime", modules)
+    assert len(imports) == 2
+    modules = [imp.module for imp in imports]
+    assert "json" in modules
+    assert "datetime" in modules
 
-    def test_syntax_error_handling(self):
-        """Test file with syntax errors returns empty"""
-        file_path = self._create_file("import os\nthis is not valid python!")
-        imports = self.extractor.extract_imports(file_path)
 
-        self.assertEqual(imports, [])
+@pytest.mark.parametrize("source", [
+    "",
+    "import os\nthis is not valid python!",
+], ids=["empty", "syntax-error"])
+def test_empty_or_invalid_source(extractor, source):
+    """Empty and unparseable sources both return no imports"""
+    assert extractor.extract_from_source(source) == []
 
-    def test_empty_file(self):
-        """Test empty file returns empty imports"""
-        file_path = self._create_file("")
-        imports = self.extractor.extract_imports(file_path)
 
-        self.assertEqual(imports, [])
-
-    def test_comments_and_strings(self):
-        """Test imports in comments/strings are ignored"""
-        content = '''
+def test_comments_and_strings(extractor):
+    """Test imports in comments/strings are ignored"""
+    content = '''
 # import fake1
 """
 import fake2
 """
 import real
 '''
-        file_path = self._create_file(content)
-        imports = self.extractor.extract_imports(file_path)
+    imports = extractor.extract_from_source(content)
+
+    assert len(imports) == 1
+    assert imports[0].module == "real"
 
-        self.assertEqual(len(imports), 1)
-        self.assertEqual(imports[0].module, "real")
 
-    def test_line_numbers(self):
-        """Test line numbers are tracked correctly"""
-        content = """
+def test_line_numbers(extractor):
+    """Test line numbers are tracked correctly"""
+    content = """
 import os
 
 import sys
 
 from json import loads
 """
-        file_path = self._create_file(content)
-        imports = self.extractor.extract_imports(file_path)
+    imports = extractor.extract_from_source(content)
 
-        # Find each import by module
-        os_import = next(i for i in imports if i.module == "os")
-        sys_import = next(i for i in imports if i.module == "sys")
-        json_import = next(i for i in imports if i.module == "json")
+    # Find each import by module
+    os_import = next(i for i in imports if i.module == "os")
+    sys_import = next(i for i in imports if i.module == "sys")
+    json_import = next(i for i in imports if i.module == "json")
 
-        self.assertEqual(os_import.line, 2)
-        self.assertEqual(sys_import.line, 4)
-        self.assertEqual(json_import.line, 6)
+    assert os_import.line == 2
+    assert sys_import.line == 4
+    assert json_import.line == 6
+
+
+def test_extract_from_file(extractor, tmp_path):
+    """Integration check for the disk-reading path"""
+    file_path = tmp_path / "test.py"
+    file_path.write_text("import os\n")
+    imports = extractor.extract_imports(file_path)
+
+    assert len(imports) == 1
+    assert imports[0].module == "os"
+    assert imports[0].names == []
+    assert imports[0].level == 0
+    assert imports[0].is_from is False
 
 
 class TestFindPythonFiles(unittest.TestCase):
     """Test Python file discovery"""
 
     def setUp(self):
-        self.temp_dir = Path(tempfile.mkdtemp())
+        # TemporaryDirectory (not bare mkdtemp) so every test removes
+        # its tree; leaked dirs make later mkdtemp name probing slower
+        self._tmp_ctx = tempfile.TemporaryDirectory()
+        self.temp_dir = Path(self._tmp_ctx.name)
+
+    def tearDown(self):
+        self._tmp_ctx.cleanup()
 
     def test_find_simple(self):
         """Test finding Python files in flat directory"""
@@ -228,4 +212,4 @@ class TestFindPythonFiles(unittest.TestCase):
 
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()